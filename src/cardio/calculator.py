@@ -131,7 +131,7 @@ def run_interactive_calculator():
         "kcal_per_min": kcal_per_min,
         "gender": gender,
     }
-    logger.debug(f"Input values: {values}")
+    logger.debug("Input values: %s", values)
 
     # Validate inputs where provided
     try:
@@ -11,8 +11,6 @@ import logging
 from typing import Optional
 from src.core.logger import get_logger
 from src.core.utils import calculate_karvonen_zones
-from src.services.fit_processor import process_fit_file
-from src.services.file_manager import extract_fit_file_metadata, rename_fit_file
 from src.config.config_manager import load_user_config
 from src.exceptions import FitFileError, InvalidFitFileError, MissingDataError, ConfigError
 
@@ -52,6 +50,9 @@ def process_fit_files_option():
     This function loads user configuration, finds all FIT files in the data directory,
     and processes each file to calculate estimated calories burned.
     """
+    # Imported here so fitparse is only loaded once FIT processing is requested
+    from src.services.fit_processor import process_fit_files
+    
     try:
         # Load configuration from file
         try:
@@ -99,9 +100,10 @@ def process_fit_files_option():
             processed_count = 0
             error_count = 0
             
-            for file_path in fit_files:
-                logger.info(f"Processing file: {os.path.basename(file_path)}")
-                result = process_fit_file(file_path, weight, age, gender)
+            results = process_fit_files(fit_files, weight, age, gender)
+            
+            for file_path, result in results.items():
+                logger.info(f"Processed file: {os.path.basename(file_path)}")
                 
                 if result.success:
                     total_calories = result.calorie_data.total_calories
@@ -140,6 +142,9 @@ def cleanup_fit_files_option():
     from each file, and renames them to a standardized format.
     """
     print("\n--- Cleaning up FIT file names ---")
+    # Imported here so fitparse is only loaded once FIT processing is requested
+    from src.services.file_manager import extract_fit_file_metadata, rename_fit_file
+    
     try:
         fit_directory = os.path.join(project_root, 'data', 'fitfiles')
         
@@ -160,13 +165,16 @@ def cleanup_fit_files_option():
         renamed_count = 0
         error_count = 0
         
+        # List the directory once; rename_fit_file keeps the set up to date
+        existing_names = set(os.listdir(fit_directory))
+        
         for file_path in fit_files:
             original_filename = os.path.basename(file_path)
             try:
                 logger.info(f"Extracting metadata for {original_filename}")
                 metadata = extract_fit_file_metadata(file_path)
                 
-                new_file_path = rename_fit_file(file_path, metadata)
+                new_file_path = rename_fit_file(file_path, metadata, existing_names)
                 
                 if new_file_path:
                     renamed_count += 1
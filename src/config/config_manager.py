@@ -7,7 +7,7 @@ providing default values when necessary and ensuring configuration integrity.
 
 import os
 import json
-from typing import Dict, Any
+from typing import Dict, Any, Optional, Tuple
 from src.core.logger import get_logger
 from src.core.utils import load_config
 from src.exceptions import ConfigError
@@ -20,6 +20,9 @@ logger = get_logger(__name__)
 # src/config/config_manager.py -> src/ -> project_root/
 project_root = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
 
+# Last validated configuration, stored with the (mtime_ns, size) of the file it came from
+_validated_config: Optional[Tuple[Tuple[int, int], Dict[str, Any]]] = None
+
 
 def load_user_config() -> Dict[str, Any]:
     """
@@ -29,6 +32,10 @@ def load_user_config() -> Dict[str, Any]:
     validates the values, and provides sensible defaults for missing or
     invalid configuration values.
     
+    The validated configuration is cached until config.json's modification
+    time or size changes, so repeated calls cost one stat() call. Each call
+    returns a new dictionary.
+    
     Returns:
         Dictionary with validated configuration values containing:
         - weight_kg: User's weight in kilograms (float)
@@ -38,8 +45,21 @@ def load_user_config() -> Dict[str, Any]:
     Raises:
         ConfigError: If the configuration file is missing, invalid, or contains invalid values
     """
+    global _validated_config
+    
+    config_path = os.path.join(project_root, 'config', 'config.json')
     try:
-        config = load_config(os.path.join(project_root, 'config', 'config.json'))
+        file_stat = os.stat(config_path)
+    except OSError:
+        # Let load_config() below report the problem
+        version = None
+    else:
+        version = (file_stat.st_mtime_ns, file_stat.st_size)
+        if _validated_config is not None and _validated_config[0] == version:
+            return dict(_validated_config[1])
+    
+    try:
+        config = load_config(config_path)
     except FileNotFoundError as e:
         logger.error("Configuration file not found")
         raise ConfigError("Configuration file not found") from e
@@ -67,7 +87,7 @@ def load_user_config() -> Dict[str, Any]:
             logger.warning(f"Invalid gender in config: {gender}. Using default 'male'.")
             gender = 'male'
             
-        return {
+        validated = {
             'weight_kg': weight,
             'age_years': age,
             'gender': gender.lower()
@@ -76,6 +96,10 @@ def load_user_config() -> Dict[str, Any]:
     except Exception as e:
         logger.error(f"Error validating configuration: {e}")
         raise ConfigError(f"Error validating configuration: {e}") from e
+    
+    if version is not None:
+        _validated_config = (version, validated)
+    return dict(validated)
 
 def get_current_config() -> Dict[str, Any]:
     """
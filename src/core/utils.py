@@ -1,7 +1,15 @@
 import json
 import logging
 import os
-from typing import Dict, Any, Union
+from functools import lru_cache
+from typing import Dict, Any, Tuple, Union
+
+# orjson parses faster when installed; its JSONDecodeError subclasses the
+# stdlib one, so callers catch the same exception either way
+try:
+    import orjson
+except ImportError:
+    orjson = None
 
 # Constants for Keytel formula
 MALE_CONSTANTS = {
@@ -20,6 +28,42 @@ FEMALE_CONSTANTS = {
     'conversion': 4.184  # Convert to kcal
 }
 
+# Tuple forms of the constants as (base, hr_coef, weight_coef, age_coef,
+# conversion); the formulas unpack them into locals instead of indexing the
+# dicts by key on every use
+_COEFFICIENT_NAMES = ('base', 'hr_coef', 'weight_coef', 'age_coef', 'conversion')
+_MALE = tuple(map(MALE_CONSTANTS.__getitem__, _COEFFICIENT_NAMES))
+_FEMALE = tuple(map(FEMALE_CONSTANTS.__getitem__, _COEFFICIENT_NAMES))
+
+_COEFFS_BY_GENDER = {'male': _MALE, 'female': _FEMALE}
+
+def _normalize_gender(gender: str) -> str:
+    """
+    Map a gender string to 'male' or 'female' for constant lookups.
+    
+    Already-normalized values are returned without creating a new string;
+    anything other than 'female' (in any case) maps to 'male'.
+    """
+    if gender in _COEFFS_BY_GENDER:
+        return gender
+    return 'female' if gender.lower() == 'female' else 'male'
+
+def keytel_coefficients(gender: str) -> Tuple[float, float, float, float, float]:
+    """
+    Get the Keytel et al. formula constants for a gender.
+    
+    Parameters:
+      - gender: 'male' or 'female' (any case; anything else maps to 'male').
+      
+    Returns:
+      - Tuple of (base, hr_coef, weight_coef, age_coef, conversion), where
+        kcal/min = (base + hr_coef * hr + weight_coef * weight + age_coef * age) / conversion.
+    """
+    return _COEFFS_BY_GENDER[_normalize_gender(gender)]
+
+# Parsed config files keyed by path, stored with the (mtime_ns, size) they were read at
+_config_cache: Dict[str, Tuple[Tuple[int, int], Dict[str, Any]]] = {}
+
 def load_config(config_file_path=None) -> Dict[str, Any]:
     """
     Loads configuration parameters from a JSON file.
@@ -27,6 +71,9 @@ def load_config(config_file_path=None) -> Dict[str, Any]:
       - weight_kg: your weight in kilograms (e.g., 70)
       - age_years: your age in years (e.g., 30)
       - gender: 'male' or 'female' (defaults to 'male' if not specified)
+      
+    The parsed file is cached and reused until its modification time or size
+    changes; each call returns a fresh copy of the top-level dictionary.
     """
     if config_file_path is None:
         # Construct the path relative to the project root
@@ -34,8 +81,24 @@ def load_config(config_file_path=None) -> Dict[str, Any]:
         project_root = os.path.abspath(os.path.join(current_dir, '..'))
         config_file_path = os.path.join(project_root, 'config', 'config.json')
 
-    with open(config_file_path, 'r') as f:
-        return json.load(f)
+    try:
+        file_stat = os.stat(config_file_path)
+    except OSError:
+        # Let open() below report the problem
+        version = None
+    else:
+        version = (file_stat.st_mtime_ns, file_stat.st_size)
+        cached = _config_cache.get(config_file_path)
+        if cached is not None and cached[0] == version:
+            return dict(cached[1])
+
+    with open(config_file_path, 'rb') as f:
+        data = f.read()
+    config = orjson.loads(data) if orjson is not None else json.loads(data)
+    if version is not None and isinstance(config, dict):
+        _config_cache[config_file_path] = (version, config)
+        return dict(config)
+    return config
 
 def calculate_kcal_per_min(hr: float, weight: float, age: float, gender: str = 'male') -> float:
     """
@@ -56,12 +119,20 @@ def calculate_kcal_per_min(hr: float, weight: float, age: float, gender: str = '
       For women:
         kcal/min = (-20.4022 + (0.4472 * hr) - (0.1263 * weight) + (0.074 * age)) / 4.184
     """
-    constants = FEMALE_CONSTANTS if gender.lower() == 'female' else MALE_CONSTANTS
+    # Normalize before the cached call so 'Female' and 'female' share entries
+    return _cached_kcal_per_min(hr, weight, age, _normalize_gender(gender))
+
+@lru_cache(maxsize=512)
+def _cached_kcal_per_min(hr: float, weight: float, age: float, gender: str) -> float:
+    """
+    Memoized Keytel kcal/min for a normalized gender ('male' or 'female').
+    
+    Heart rates are whole bpm and weight, age and gender are fixed for a
+    session, so the same arguments recur and repeated calls become lookups.
+    """
+    base, hr_coef, weight_coef, age_coef, conversion = _COEFFS_BY_GENDER[gender]
     
-    return (constants['base'] + 
-            (constants['hr_coef'] * hr) + 
-            (constants['weight_coef'] * weight) + 
-            (constants['age_coef'] * age)) / constants['conversion']
+    return (base + (hr_coef * hr) + (weight_coef * weight) + (age_coef * age)) / conversion
 
 def calories_burned(hr: float, duration_minutes: float, weight: float, age: float, gender: str = 'male') -> float:
     """
@@ -84,28 +155,28 @@ def calculate_heart_rate(kcal_per_min: float, weight: float, age: float, gender:
     """
     Solve for heart rate given kcal_per_min, weight, and age.
     """
-    constants = FEMALE_CONSTANTS if gender.lower() == 'female' else MALE_CONSTANTS
+    base, hr_coef, weight_coef, age_coef, conversion = _COEFFS_BY_GENDER[_normalize_gender(gender)]
     
-    return (constants['conversion'] * kcal_per_min - constants['base'] - 
-            constants['weight_coef'] * weight - constants['age_coef'] * age) / constants['hr_coef']
+    return (conversion * kcal_per_min - base - 
+            weight_coef * weight - age_coef * age) / hr_coef
 
 def calculate_weight(kcal_per_min: float, heart_rate: float, age: float, gender: str = 'male') -> float:
     """
     Solve for weight given kcal_per_min, heart_rate, and age.
     """
-    constants = FEMALE_CONSTANTS if gender.lower() == 'female' else MALE_CONSTANTS
+    base, hr_coef, weight_coef, age_coef, conversion = _COEFFS_BY_GENDER[_normalize_gender(gender)]
     
-    return (constants['conversion'] * kcal_per_min - constants['base'] - 
-            constants['hr_coef'] * heart_rate - constants['age_coef'] * age) / constants['weight_coef']
+    return (conversion * kcal_per_min - base - 
+            hr_coef * heart_rate - age_coef * age) / weight_coef
 
 def calculate_age(kcal_per_min: float, heart_rate: float, weight: float, gender: str = 'male') -> float:
     """
     Solve for age given kcal_per_min, heart_rate, and weight.
     """
-    constants = FEMALE_CONSTANTS if gender.lower() == 'female' else MALE_CONSTANTS
+    base, hr_coef, weight_coef, age_coef, conversion = _COEFFS_BY_GENDER[_normalize_gender(gender)]
     
-    return (constants['conversion'] * kcal_per_min - constants['base'] - 
-            constants['hr_coef'] * heart_rate - constants['weight_coef'] * weight) / constants['age_coef']
+    return (conversion * kcal_per_min - base - 
+            hr_coef * heart_rate - weight_coef * weight) / age_coef
 
 def calculate_karvonen_zones(age: int, resting_heart_rate: int, intensity_percentages: list, max_heart_rate: Union[int, None] = None) -> Dict[str, tuple]:
     """
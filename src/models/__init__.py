@@ -5,15 +5,42 @@ This package contains data classes and models for representing:
 - Heart rate data and calorie calculations
 - FIT file metadata and device information
 - Processing results and validation structures
+
+Submodules are imported lazily on first attribute access, so importing one
+model module does not pay for loading the others.
 """
 
-from .fit_data import HeartRateData, CalorieData, ProcessingResult
-from .metadata import FitFileMetadata, DeviceInfo
+import importlib
+
+# Maps each exported name to the submodule that defines it
+_EXPORTS = {
+    'HeartRateData': 'fit_data',
+    'HeartRateSeries': 'fit_data',
+    'CalorieData': 'fit_data',
+    'ProcessingResult': 'fit_data',
+    'FitFileMetadata': 'metadata',
+    'DeviceInfo': 'metadata',
+}
 
 __all__ = [
     'HeartRateData',
+    'HeartRateSeries',
     'CalorieData', 
     'ProcessingResult',
     'FitFileMetadata',
     'DeviceInfo'
-]
\ No newline at end of file
+]
+
+
+def __getattr__(name):
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f'.{module_name}', __name__), name)
+    # Cache on the package so later lookups bypass __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,17 @@
+"""
+Settings and constants shared by the data model modules and the services
+and validators that check values against them.
+"""
+
+import os
+
+# Field validation in __post_init__ can be skipped for speed by running Python
+# with -O or by setting the FITCALC_FAST environment variable. validate() can
+# still be called explicitly on any instance.
+_VALIDATE = __debug__ and not os.environ.get("FITCALC_FAST")
+
+# Accepted types for numeric values, built once instead of on every check
+_NUMBER_TYPES = (int, float)
+
+# Accepted (normalized) gender values
+_VALID_GENDERS = frozenset(('male', 'female'))
@@ -5,12 +5,29 @@ This module contains dataclasses for representing heart rate data,
 calorie calculation results, and processing outcomes.
 """
 
+from array import array
+from bisect import bisect_left, bisect_right
 from dataclasses import dataclass
-from datetime import datetime
-from typing import List, Tuple, Optional, Any
+from datetime import datetime, timedelta, timezone
+from itertools import islice, repeat
+from math import isnan
+from operator import attrgetter, itemgetter, le, sub
+from typing import List, Tuple, Optional, Any, Union
+from src.models._common import _NUMBER_TYPES, _VALID_GENDERS, _VALIDATE
 
+# Accessors for map(), which converts and sums whole columns without a
+# Python-level call per item
+_get_heart_rate = attrgetter('heart_rate')
+_get_first = itemgetter(0)
+_get_second = itemgetter(1)
+_get_tzinfo = attrgetter('tzinfo')
 
-@dataclass
+# Reference points for converting naive and timezone-aware datetimes to epoch seconds
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+@dataclass(slots=True)
 class HeartRateData:
     """
     Represents heart rate data from a FIT file.
@@ -25,11 +42,31 @@ class HeartRateData:
     interval_minutes: Optional[float] = None
     
     def __post_init__(self):
-        """Validate heart rate data after initialization."""
+        """Validate heart rate data after initialization unless validation is disabled."""
+        if _VALIDATE:
+            self.validate()
+    
+    def validate(self) -> None:
+        """
+        Validate heart rate data fields.
+        
+        Raises:
+            TypeError: If a field has the wrong type
+            ValueError: If a field value is out of range
+        """
+        # Common case: a valid sample with no interval passes with one type
+        # check and one chained comparison before the detailed checks below.
+        heart_rate = self.heart_rate
+        if (self.interval_minutes is None
+                and type(heart_rate) is int
+                and 0 < heart_rate <= 250
+                and isinstance(self.timestamp, datetime)):
+            return
+        
         if not isinstance(self.timestamp, datetime):
             raise TypeError("timestamp must be a datetime object")
         
-        if not isinstance(self.heart_rate, (int, float)):
+        if not isinstance(self.heart_rate, _NUMBER_TYPES):
             raise TypeError("heart_rate must be a number")
             
         if self.heart_rate <= 0:
@@ -39,13 +76,182 @@ class HeartRateData:
             raise ValueError("heart_rate exceeds physiological maximum (250 bpm)")
             
         if self.interval_minutes is not None:
-            if not isinstance(self.interval_minutes, (int, float)):
+            if not isinstance(self.interval_minutes, _NUMBER_TYPES):
                 raise TypeError("interval_minutes must be a number")
             if self.interval_minutes < 0:
                 raise ValueError("interval_minutes cannot be negative")
+    
+    @classmethod
+    def _unchecked(cls, timestamp: datetime, heart_rate: Union[int, float],
+                   interval_minutes: Optional[float] = None) -> 'HeartRateData':
+        """
+        Build an instance without running __init__ or validation.
+        
+        Only for callers that have already validated the values in bulk.
+        """
+        obj = object.__new__(cls)
+        object.__setattr__(obj, 'timestamp', timestamp)
+        object.__setattr__(obj, 'heart_rate', heart_rate)
+        object.__setattr__(obj, 'interval_minutes', interval_minutes)
+        return obj
+
+
+@dataclass(slots=True)
+class HeartRateSeries:
+    """
+    Represents heart rate data as parallel columns (struct-of-arrays).
+    
+    Storing samples as two compact arrays instead of one HeartRateData object
+    per sample keeps long activities small in memory and lets aggregate
+    calculations work directly on the columns.
+    
+    Attributes:
+        timestamps: Sample times in seconds since the Unix epoch (array of doubles)
+        heart_rates: Heart rates in beats per minute (array of unsigned bytes
+                     for whole-bpm data, otherwise array of doubles)
+    """
+    timestamps: array
+    heart_rates: array
+    
+    def __post_init__(self):
+        """Validate heart rate series after initialization unless validation is disabled."""
+        if _VALIDATE:
+            self.validate()
+    
+    def validate(self) -> None:
+        """
+        Validate heart rate series fields.
+        
+        Raises:
+            TypeError: If a field has the wrong type
+            ValueError: If a field value is out of range
+        """
+        if not isinstance(self.timestamps, array):
+            raise TypeError("timestamps must be an array")
+            
+        if not isinstance(self.heart_rates, array):
+            raise TypeError("heart_rates must be an array")
+            
+        if len(self.timestamps) != len(self.heart_rates):
+            raise ValueError("timestamps and heart_rates must have the same length")
+            
+        if self.heart_rates:
+            # A NaN in a double column would let min/max step over bad values
+            if self.heart_rates.typecode != 'B' and any(map(isnan, self.heart_rates)):
+                raise ValueError("heart_rates must not contain NaN")
+            if min(self.heart_rates) <= 0:
+                raise ValueError("heart_rates must be positive")
+            if max(self.heart_rates) > 250:
+                raise ValueError("heart_rates exceed physiological maximum (250 bpm)")
+    
+    def __len__(self) -> int:
+        return len(self.heart_rates)
+    
+    def is_sorted(self) -> bool:
+        """Check whether the timestamps are in ascending order."""
+        timestamps = self.timestamps
+        return all(map(le, timestamps, islice(timestamps, 1, None)))
+    
+    def sorted_by_time(self) -> 'HeartRateSeries':
+        """
+        Get the series ordered by timestamp.
+        
+        Returns:
+            This series if it is already in order, otherwise a new series
+            with the samples stably sorted by timestamp
+        """
+        if self.is_sorted():
+            return self
+        order = sorted(range(len(self.timestamps)), key=self.timestamps.__getitem__)
+        return HeartRateSeries(
+            timestamps=array('d', map(self.timestamps.__getitem__, order)),
+            heart_rates=array(self.heart_rates.typecode, map(self.heart_rates.__getitem__, order))
+        )
+    
+    def between(self, start: datetime, end: datetime) -> 'HeartRateSeries':
+        """
+        Get the samples recorded from start to end, inclusive.
+        
+        The bounds are found by binary search over the timestamps, so the
+        series must be sorted by time (as returned by sorted_by_time()). Only
+        the selected samples are copied.
+        
+        Args:
+            start: First time to include
+            end: Last time to include
+            
+        Returns:
+            New HeartRateSeries holding the samples in [start, end]
+        """
+        timestamps = self.timestamps
+        first = bisect_left(timestamps, to_epoch_seconds(start))
+        stop = bisect_right(timestamps, to_epoch_seconds(end), lo=first)
+        return HeartRateSeries(timestamps=timestamps[first:stop], heart_rates=self.heart_rates[first:stop])
+    
+    @classmethod
+    def from_tuples(cls, data_tuples: List[Tuple[datetime, Union[int, float]]]) -> 'HeartRateSeries':
+        """
+        Build a series from a list of (timestamp, heart_rate) tuples.
+        
+        Args:
+            data_tuples: List of (timestamp, heart_rate) tuples
+            
+        Returns:
+            HeartRateSeries holding the same samples in the same order
+            
+        Raises:
+            TypeError: If input is not a list or contains invalid items
+            ValueError: If heart rate values are invalid
+        """
+        if not isinstance(data_tuples, list):
+            raise TypeError("data_tuples must be a list")
+        
+        # Convert column by column; a batch with any malformed row goes
+        # through the row-by-row loop below, which reports it
+        if (all(map(isinstance, data_tuples, repeat(tuple)))
+                and set(map(len, data_tuples)) <= {2}):
+            timestamp_column = list(map(_get_first, data_tuples))
+            heart_rate_column = list(map(_get_second, data_tuples))
+            if (all(map(isinstance, timestamp_column, repeat(datetime)))
+                    and all(map(isinstance, heart_rate_column, repeat(_NUMBER_TYPES)))):
+                try:
+                    # Whole bpm values in 0-255 go straight into a byte column
+                    heart_rates = array('B', heart_rate_column)
+                except (TypeError, OverflowError):
+                    heart_rates = compact_heart_rates(array('d', heart_rate_column))
+                return cls(timestamps=epoch_seconds_column(timestamp_column), heart_rates=heart_rates)
+            
+        timestamps = array('d', [0.0]) * len(data_tuples)
+        heart_rates = array('d', [0.0]) * len(data_tuples)
+        for i, item in enumerate(data_tuples):
+            if not isinstance(item, tuple) or len(item) != 2:
+                raise TypeError(f"Item {i} must be a tuple of length 2")
+                
+            timestamp, heart_rate = item
+            if not isinstance(timestamp, datetime):
+                raise TypeError(f"Timestamp at index {i} must be a datetime object")
+            if not isinstance(heart_rate, _NUMBER_TYPES):
+                raise TypeError(f"Heart rate at index {i} must be a number")
+                
+            timestamps[i] = to_epoch_seconds(timestamp)
+            heart_rates[i] = heart_rate
+            
+        return cls(timestamps=timestamps, heart_rates=compact_heart_rates(heart_rates))
+    
+    def to_tuples(self) -> List[Tuple[datetime, Union[int, float]]]:
+        """
+        Convert the series back to a list of (timestamp, heart_rate) tuples.
+        
+        Timestamps are rebuilt as naive UTC datetimes, the form fitparse
+        returns them in.
+        
+        Returns:
+            List of (timestamp, heart_rate) tuples in series order
+        """
+        return list(zip(map(from_epoch_seconds, self.timestamps), self.heart_rates))
 
 
-@dataclass
+@dataclass(slots=True)
 class CalorieData:
     """
     Represents calorie calculation results.
@@ -68,35 +274,46 @@ class CalorieData:
     intervals_processed: int
     
     def __post_init__(self):
-        """Validate calorie data after initialization."""
-        if not isinstance(self.total_calories, (int, float)):
+        """Validate calorie data after initialization unless validation is disabled."""
+        if _VALIDATE:
+            self.validate()
+    
+    def validate(self) -> None:
+        """
+        Validate calorie data fields.
+        
+        Raises:
+            TypeError: If a field has the wrong type
+            ValueError: If a field value is out of range
+        """
+        if not isinstance(self.total_calories, _NUMBER_TYPES):
             raise TypeError("total_calories must be a number")
         if self.total_calories < 0:
             raise ValueError("total_calories cannot be negative")
             
-        if not isinstance(self.average_heart_rate, (int, float)):
+        if not isinstance(self.average_heart_rate, _NUMBER_TYPES):
             raise TypeError("average_heart_rate must be a number")
         if self.average_heart_rate <= 0:
             raise ValueError("average_heart_rate must be positive")
             
-        if not isinstance(self.duration_minutes, (int, float)):
+        if not isinstance(self.duration_minutes, _NUMBER_TYPES):
             raise TypeError("duration_minutes must be a number")
         if self.duration_minutes < 0:
             raise ValueError("duration_minutes cannot be negative")
             
-        if not isinstance(self.weight, (int, float)):
+        if not isinstance(self.weight, _NUMBER_TYPES):
             raise TypeError("weight must be a number")
         if self.weight <= 0:
             raise ValueError("weight must be positive")
             
-        if not isinstance(self.age, (int, float)):
+        if not isinstance(self.age, _NUMBER_TYPES):
             raise TypeError("age must be a number")
         if self.age <= 0:
             raise ValueError("age must be positive")
             
         if not isinstance(self.gender, str):
             raise TypeError("gender must be a string")
-        if self.gender.lower() not in ['male', 'female']:
+        if self.gender.lower() not in _VALID_GENDERS:
             raise ValueError("gender must be 'male' or 'female'")
             
         if not isinstance(self.intervals_processed, int):
@@ -105,7 +322,7 @@ class CalorieData:
             raise ValueError("intervals_processed cannot be negative")
 
 
-@dataclass
+@dataclass(slots=True)
 class ProcessingResult:
     """
     Represents the complete result of FIT file processing.
@@ -118,6 +335,8 @@ class ProcessingResult:
         error_message: Error message if processing failed
         processing_time_seconds: Time taken to process the file
         metadata: Additional metadata from processing
+        heart_rate_series: Heart rate samples as columns; converted to
+                           heart_rate_data on the first get_heart_rate_data() call
     """
     file_path: str
     success: bool
@@ -126,9 +345,21 @@ class ProcessingResult:
     error_message: Optional[str] = None
     processing_time_seconds: Optional[float] = None
     metadata: Optional[dict] = None
+    heart_rate_series: Optional[HeartRateSeries] = None
     
     def __post_init__(self):
-        """Validate processing result after initialization."""
+        """Validate processing result after initialization unless validation is disabled."""
+        if _VALIDATE:
+            self.validate()
+    
+    def validate(self) -> None:
+        """
+        Validate processing result fields.
+        
+        Raises:
+            TypeError: If a field has the wrong type
+            ValueError: If a field value is out of range
+        """
         if not isinstance(self.file_path, str):
             raise TypeError("file_path must be a string")
         if not self.file_path:
@@ -149,15 +380,34 @@ class ProcessingResult:
         if self.heart_rate_data is not None:
             if not isinstance(self.heart_rate_data, list):
                 raise TypeError("heart_rate_data must be a list")
-            for item in self.heart_rate_data:
-                if not isinstance(item, HeartRateData):
-                    raise TypeError("All items in heart_rate_data must be HeartRateData instances")
+            # Items are validated when each HeartRateData is constructed, so
+            # only spot-check the element type rather than walking the list
+            if self.heart_rate_data and not (isinstance(self.heart_rate_data[0], HeartRateData) and
+                                             isinstance(self.heart_rate_data[-1], HeartRateData)):
+                raise TypeError("All items in heart_rate_data must be HeartRateData instances")
+                
+        if self.heart_rate_series is not None and not isinstance(self.heart_rate_series, HeartRateSeries):
+            raise TypeError("heart_rate_series must be a HeartRateSeries instance")
                     
         if self.processing_time_seconds is not None:
-            if not isinstance(self.processing_time_seconds, (int, float)):
+            if not isinstance(self.processing_time_seconds, _NUMBER_TYPES):
                 raise TypeError("processing_time_seconds must be a number")
             if self.processing_time_seconds < 0:
                 raise ValueError("processing_time_seconds cannot be negative")
+    
+    def get_heart_rate_data(self) -> Optional[List[HeartRateData]]:
+        """
+        Get the heart rate data as HeartRateData objects.
+        
+        Objects are only built from heart_rate_series when first requested,
+        since most callers only need the calorie totals.
+        
+        Returns:
+            List of HeartRateData objects, or None if no heart rate data was kept
+        """
+        if self.heart_rate_data is None and self.heart_rate_series is not None:
+            self.heart_rate_data = create_heart_rate_data_from_tuples(self.heart_rate_series.to_tuples())
+        return self.heart_rate_data
 
 
 def create_heart_rate_data_from_tuples(data_tuples: List[Tuple[datetime, int]]) -> List[HeartRateData]:
@@ -177,23 +427,117 @@ def create_heart_rate_data_from_tuples(data_tuples: List[Tuple[datetime, int]])
     if not isinstance(data_tuples, list):
         raise TypeError("data_tuples must be a list")
         
-    heart_rate_data = []
+    # Type-check every row in one tight loop specialised to the two fields, so
+    # the batch is fully validated here even when model validation is disabled
     for i, item in enumerate(data_tuples):
         if not isinstance(item, tuple) or len(item) != 2:
             raise TypeError(f"Item {i} must be a tuple of length 2")
-            
-        timestamp, heart_rate = item
-        heart_rate_data.append(HeartRateData(timestamp=timestamp, heart_rate=heart_rate))
+        if not isinstance(item[0], datetime):
+            raise TypeError(f"Timestamp at index {i} must be a datetime object")
+        if not isinstance(item[1], _NUMBER_TYPES):
+            raise TypeError(f"Heart rate at index {i} must be a number")
+    
+    # Range-check the whole heart rate column up front so an invalid batch
+    # is rejected before any objects are built
+    heart_rates = [item[1] for item in data_tuples]
+    if heart_rates:
+        # NaN compares false both ways, so min/max can step over it
+        if min(heart_rates) <= 0 or max(heart_rates) > 250 or any(map(isnan, heart_rates)):
+            index = next(i for i, hr in enumerate(heart_rates) if not 0 < hr <= 250)
+            raise ValueError(f"Heart rate at index {index} is outside the valid range (0-250 bpm]: {heart_rates[index]}")
+        
+    # Every row has been checked above, so skip per-instance validation
+    unchecked = HeartRateData._unchecked
+    heart_rate_data = [None] * len(data_tuples)
+    for i, (timestamp, heart_rate) in enumerate(data_tuples):
+        heart_rate_data[i] = unchecked(timestamp, heart_rate)
         
     return heart_rate_data
 
 
-def calculate_average_heart_rate(heart_rate_data: List[HeartRateData]) -> float:
+def compact_heart_rates(heart_rates: array) -> array:
+    """
+    Store a heart rate column as one unsigned byte per sample when possible.
+    
+    FIT devices record heart rate as whole beats per minute in the range
+    0-255, so a byte column holds the same values at 1/8 the size of doubles.
+    Columns with fractional or out-of-range values are returned unchanged.
+    
+    Args:
+        heart_rates: Array of heart rate values
+        
+    Returns:
+        An array('B') with the same values, or the original array
+    """
+    if heart_rates.typecode == 'B' or not heart_rates:
+        return heart_rates
+    if min(heart_rates) < 0 or max(heart_rates) > 255:
+        return heart_rates
+    if heart_rates.typecode == 'd':
+        if not all(map(float.is_integer, heart_rates)):
+            return heart_rates
+    elif not all(float(hr).is_integer() for hr in heart_rates):
+        return heart_rates
+    return array('B', map(int, heart_rates))
+
+
+def epoch_seconds_column(timestamps: List[datetime]) -> array:
+    """
+    Convert a list of datetimes to an array of seconds since the Unix epoch.
+    
+    Equivalent to applying to_epoch_seconds to every item; when all the
+    datetimes are naive the whole column is converted with map().
+    
+    Args:
+        timestamps: List of datetimes to convert
+        
+    Returns:
+        Array of doubles with one epoch-seconds value per datetime
+    """
+    if any(map(_get_tzinfo, timestamps)):
+        return array('d', map(to_epoch_seconds, timestamps))
+    return array('d', map(timedelta.total_seconds, map(sub, timestamps, repeat(_EPOCH))))
+
+
+def to_epoch_seconds(timestamp: datetime) -> float:
+    """
+    Convert a datetime to seconds since the Unix epoch.
+    
+    Naive datetimes (as produced by fitparse) are treated as UTC rather than
+    local time, so intervals never shift across daylight saving transitions.
+    
+    Args:
+        timestamp: The datetime to convert
+        
+    Returns:
+        Seconds since 1970-01-01T00:00:00 UTC
+    """
+    epoch = _EPOCH if timestamp.tzinfo is None else _EPOCH_UTC
+    return (timestamp - epoch).total_seconds()
+
+
+def from_epoch_seconds(seconds: float) -> datetime:
+    """
+    Convert seconds since the Unix epoch to a naive UTC datetime.
+    
+    The inverse of to_epoch_seconds for naive datetimes.
+    
+    Args:
+        seconds: Seconds since 1970-01-01T00:00:00 UTC
+        
+    Returns:
+        Naive datetime in UTC, as fitparse produces
+    """
+    return _EPOCH + timedelta(seconds=seconds)
+
+
+def calculate_average_heart_rate(heart_rate_data: Union[List[HeartRateData], HeartRateSeries, array]) -> float:
     """
     Calculate the average heart rate from a list of HeartRateData objects.
     
     Args:
-        heart_rate_data: List of HeartRateData objects
+        heart_rate_data: List of HeartRateData objects, a HeartRateSeries, or
+                         an array of heart rate values
         
     Returns:
         Average heart rate
@@ -202,6 +546,15 @@ def calculate_average_heart_rate(heart_rate_data: List[HeartRateData]) -> float:
         ValueError: If the list is empty
         TypeError: If input is not a list of HeartRateData objects
     """
+    if isinstance(heart_rate_data, HeartRateSeries):
+        heart_rate_data = heart_rate_data.heart_rates
+        
+    if isinstance(heart_rate_data, array):
+        # Numeric column: sum it directly
+        if not heart_rate_data:
+            raise ValueError("heart_rate_data cannot be empty")
+        return sum(heart_rate_data) / len(heart_rate_data)
+        
     if not isinstance(heart_rate_data, list):
         raise TypeError("heart_rate_data must be a list")
         
@@ -212,16 +565,16 @@ def calculate_average_heart_rate(heart_rate_data: List[HeartRateData]) -> float:
         if not isinstance(item, HeartRateData):
             raise TypeError("All items must be HeartRateData instances")
             
-    total_hr = sum(data.heart_rate for data in heart_rate_data)
+    total_hr = sum(map(_get_heart_rate, heart_rate_data))
     return total_hr / len(heart_rate_data)
 
 
-def calculate_total_duration(heart_rate_data: List[HeartRateData]) -> float:
+def calculate_total_duration(heart_rate_data: Union[List[HeartRateData], HeartRateSeries]) -> float:
     """
     Calculate the total duration from a list of HeartRateData objects.
     
     Args:
-        heart_rate_data: List of HeartRateData objects sorted by timestamp
+        heart_rate_data: List of HeartRateData objects sorted by timestamp, or a HeartRateSeries
         
     Returns:
         Total duration in minutes
@@ -230,19 +583,69 @@ def calculate_total_duration(heart_rate_data: List[HeartRateData]) -> float:
         ValueError: If the list has fewer than 2 items
         TypeError: If input is not a list of HeartRateData objects
     """
+    if isinstance(heart_rate_data, HeartRateSeries):
+        if len(heart_rate_data) < 2:
+            raise ValueError("At least 2 heart rate data points are required")
+        timestamps = heart_rate_data.timestamps
+        return (max(timestamps) - min(timestamps)) / 60.0
+        
     if not isinstance(heart_rate_data, list):
         raise TypeError("heart_rate_data must be a list")
         
     if len(heart_rate_data) < 2:
         raise ValueError("At least 2 heart rate data points are required")
         
+    # Track the earliest and latest timestamps while type-checking, so the
+    # data is scanned once instead of being sorted
+    start_time = end_time = None
     for item in heart_rate_data:
         if not isinstance(item, HeartRateData):
             raise TypeError("All items must be HeartRateData instances")
-            
-    # Sort by timestamp to ensure correct calculation
-    sorted_data = sorted(heart_rate_data, key=lambda x: x.timestamp)
-    start_time = sorted_data[0].timestamp
-    end_time = sorted_data[-1].timestamp
+        timestamp = item.timestamp
+        if start_time is None or timestamp < start_time:
+            start_time = timestamp
+        if end_time is None or timestamp > end_time:
+            end_time = timestamp
+    
+    return (end_time - start_time).total_seconds() / 60.0
+
+def summarize_heart_rate_data(heart_rate_data: Union[List[HeartRateData], HeartRateSeries]) -> Tuple[float, float]:
+    """
+    Calculate the average heart rate and total duration together.
+    
+    Lists of HeartRateData are summarized in a single pass that accumulates
+    the heart rate sum and the earliest/latest timestamps at the same time,
+    instead of one pass for each statistic.
+    
+    Args:
+        heart_rate_data: List of HeartRateData objects or a HeartRateSeries
+        
+    Returns:
+        Tuple of (average heart rate, total duration in minutes)
+        
+    Raises:
+        ValueError: If there are fewer than 2 data points
+        TypeError: If input is not a list of HeartRateData objects
+    """
+    if isinstance(heart_rate_data, HeartRateSeries):
+        return calculate_average_heart_rate(heart_rate_data), calculate_total_duration(heart_rate_data)
+        
+    if not isinstance(heart_rate_data, list):
+        raise TypeError("heart_rate_data must be a list")
+        
+    if len(heart_rate_data) < 2:
+        raise ValueError("At least 2 heart rate data points are required")
+        
+    total_hr = 0
+    start_time = end_time = None
+    for item in heart_rate_data:
+        if not isinstance(item, HeartRateData):
+            raise TypeError("All items must be HeartRateData instances")
+        total_hr += item.heart_rate
+        timestamp = item.timestamp
+        if start_time is None or timestamp < start_time:
+            start_time = timestamp
+        if end_time is None or timestamp > end_time:
+            end_time = timestamp
     
-    return (end_time - start_time).total_seconds() / 60.0
\ No newline at end of file
+    return total_hr / len(heart_rate_data), (end_time - start_time).total_seconds() / 60.0
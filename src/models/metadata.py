@@ -5,12 +5,13 @@ This module contains dataclasses for representing metadata extracted
 from FIT files, including activity information and device details.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields, replace
 from datetime import datetime
 from typing import Optional, Dict, Any
+from src.models._common import _NUMBER_TYPES, _VALIDATE
 
 
-@dataclass
+@dataclass(slots=True)
 class DeviceInfo:
     """
     Represents device information from a FIT file.
@@ -24,6 +25,10 @@ class DeviceInfo:
         device_type: Type of device (e.g., 'watch', 'bike_computer')
         battery_status: Battery status if available
     """
+    # Dictionary memoized by to_dict() and reset on field changes. Declared
+    # first so __init__ sets it before any field assignment checks it.
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
     manufacturer: Optional[str] = None
     product: Optional[str] = None
     serial_number: Optional[str] = None
@@ -32,8 +37,24 @@ class DeviceInfo:
     device_type: Optional[str] = None
     battery_status: Optional[str] = None
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        if name != '_dict_cache' and self._dict_cache is not None:
+            object.__setattr__(self, '_dict_cache', None)
+    
     def __post_init__(self):
-        """Validate device info after initialization."""
+        """Validate device info after initialization unless validation is disabled."""
+        if _VALIDATE:
+            self.validate()
+    
+    def validate(self) -> None:
+        """
+        Validate device info fields.
+        
+        Raises:
+            TypeError: If a field has the wrong type
+            ValueError: If a field value is out of range
+        """
         # Convert None values to proper types and validate non-None values
         if self.manufacturer is not None and not isinstance(self.manufacturer, str):
             raise TypeError("manufacturer must be a string or None")
@@ -69,21 +90,30 @@ class DeviceInfo:
         """
         Convert device info to dictionary.
         
+        The dictionary is built once and reused until a field changes; each
+        call returns a copy, so callers may modify it.
+        
         Returns:
             Dictionary representation of device info
         """
-        return {
-            'manufacturer': self.manufacturer,
-            'product': self.product,
-            'serial_number': self.serial_number,
-            'software_version': self.software_version,
-            'hardware_version': self.hardware_version,
-            'device_type': self.device_type,
-            'battery_status': self.battery_status
-        }
+        return dict(self._memoized_dict())
+    
+    def _memoized_dict(self) -> Dict[str, Any]:
+        """Get the memoized dictionary behind to_dict(), building it if needed."""
+        if self._dict_cache is None:
+            self._dict_cache = {
+                'manufacturer': self.manufacturer,
+                'product': self.product,
+                'serial_number': self.serial_number,
+                'software_version': self.software_version,
+                'hardware_version': self.hardware_version,
+                'device_type': self.device_type,
+                'battery_status': self.battery_status
+            }
+        return self._dict_cache
 
 
-@dataclass
+@dataclass(slots=True)
 class FitFileMetadata:
     """
     Represents metadata extracted from a FIT file.
@@ -103,6 +133,12 @@ class FitFileMetadata:
         file_size_bytes: Size of the FIT file in bytes
         created_timestamp: When the metadata was extracted
     """
+    # Derived values memoized on first use and reset whenever a field changes.
+    # Declared first so __init__ sets them before any field assignment checks them.
+    _activity_name: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _duration_formatted: Optional[str] = field(default=None, init=False, repr=False, compare=False)
+    _dict_cache: Optional[Dict[str, Any]] = field(default=None, init=False, repr=False, compare=False)
+    
     start_time: Optional[datetime] = None
     end_time: Optional[datetime] = None
     duration_seconds: float = 0.0
@@ -118,14 +154,25 @@ class FitFileMetadata:
     created_timestamp: Optional[datetime] = None
     
     def __post_init__(self):
-        """Validate metadata after initialization."""
+        """Validate metadata after initialization unless validation is disabled."""
+        if _VALIDATE:
+            self.validate()
+    
+    def validate(self) -> None:
+        """
+        Validate metadata fields.
+        
+        Raises:
+            TypeError: If a field has the wrong type
+            ValueError: If a field value is out of range
+        """
         if self.start_time is not None and not isinstance(self.start_time, datetime):
             raise TypeError("start_time must be a datetime object or None")
             
         if self.end_time is not None and not isinstance(self.end_time, datetime):
             raise TypeError("end_time must be a datetime object or None")
             
-        if not isinstance(self.duration_seconds, (int, float)):
+        if not isinstance(self.duration_seconds, _NUMBER_TYPES):
             raise TypeError("duration_seconds must be a number")
         if self.duration_seconds < 0:
             raise ValueError("duration_seconds cannot be negative")
@@ -137,25 +184,25 @@ class FitFileMetadata:
             raise TypeError("sub_sport must be a string")
             
         if self.total_distance is not None:
-            if not isinstance(self.total_distance, (int, float)):
+            if not isinstance(self.total_distance, _NUMBER_TYPES):
                 raise TypeError("total_distance must be a number or None")
             if self.total_distance < 0:
                 raise ValueError("total_distance cannot be negative")
                 
         if self.total_calories is not None:
-            if not isinstance(self.total_calories, (int, float)):
+            if not isinstance(self.total_calories, _NUMBER_TYPES):
                 raise TypeError("total_calories must be a number or None")
             if self.total_calories < 0:
                 raise ValueError("total_calories cannot be negative")
                 
         if self.avg_heart_rate is not None:
-            if not isinstance(self.avg_heart_rate, (int, float)):
+            if not isinstance(self.avg_heart_rate, _NUMBER_TYPES):
                 raise TypeError("avg_heart_rate must be a number or None")
             if self.avg_heart_rate <= 0:
                 raise ValueError("avg_heart_rate must be positive")
                 
         if self.max_heart_rate is not None:
-            if not isinstance(self.max_heart_rate, (int, float)):
+            if not isinstance(self.max_heart_rate, _NUMBER_TYPES):
                 raise TypeError("max_heart_rate must be a number or None")
             if self.max_heart_rate <= 0:
                 raise ValueError("max_heart_rate must be positive")
@@ -201,6 +248,37 @@ class FitFileMetadata:
         return (self.start_time is not None and 
                 (self.duration_seconds > 0 or self.end_time is not None))
     
+    def __setattr__(self, name: str, value: Any) -> None:
+        object.__setattr__(self, name, value)
+        # Changing a field invalidates the derived values cached below; there
+        # is nothing to clear until one of them has been computed
+        if name not in _CACHED_METADATA_ATTRS and (
+                self._activity_name is not None or self._duration_formatted is not None
+                or self._dict_cache is not None):
+            for cached in _CACHED_METADATA_ATTRS:
+                object.__setattr__(self, cached, None)
+    
+    @property
+    def activity_name(self) -> str:
+        """
+        Formatted activity name combining sport and sub_sport, computed once.
+        """
+        if self._activity_name is None:
+            if self.sub_sport != 'Unknown' and self.sub_sport != self.sport:
+                self._activity_name = f"{self.sport} - {self.sub_sport}"
+            else:
+                self._activity_name = self.sport
+        return self._activity_name
+    
+    @property
+    def duration_formatted(self) -> str:
+        """
+        Duration formatted as "Xh Ym" or "Ym" or "Xs", computed once.
+        """
+        if self._duration_formatted is None:
+            self._duration_formatted = _format_duration(int(self.duration_seconds))
+        return self._duration_formatted
+    
     def get_activity_name(self) -> str:
         """
         Get a formatted activity name.
@@ -208,9 +286,7 @@ class FitFileMetadata:
         Returns:
             Formatted activity name combining sport and sub_sport
         """
-        if self.sub_sport != 'Unknown' and self.sub_sport != self.sport:
-            return f"{self.sport} - {self.sub_sport}"
-        return self.sport
+        return self.activity_name
     
     def get_duration_formatted(self) -> str:
         """
@@ -219,30 +295,10 @@ class FitFileMetadata:
         Returns:
             Duration formatted as "Xh Ym" or "Ym" or "Xs"
         """
-        if self.duration_seconds == 0:
-            return "0s"
-            
-        hours = int(self.duration_seconds // 3600)
-        minutes = int((self.duration_seconds % 3600) // 60)
-        seconds = int(self.duration_seconds % 60)
-        
-        if hours > 0:
-            if minutes > 0:
-                return f"{hours}h {minutes}m"
-            else:
-                return f"{hours}h"
-        elif minutes > 0:
-            return f"{minutes}m"
-        else:
-            return f"{seconds}s"
+        return self.duration_formatted
     
-    def to_dict(self) -> Dict[str, Any]:
-        """
-        Convert metadata to dictionary.
-        
-        Returns:
-            Dictionary representation of metadata
-        """
+    def _build_dict(self) -> Dict[str, Any]:
+        """Build the dictionary representation cached by to_dict()."""
         return {
             'start_time': self.start_time.isoformat() if self.start_time else None,
             'end_time': self.end_time.isoformat() if self.end_time else None,
@@ -253,14 +309,58 @@ class FitFileMetadata:
             'total_calories': self.total_calories,
             'avg_heart_rate': self.avg_heart_rate,
             'max_heart_rate': self.max_heart_rate,
-            'device_info': self.device_info.to_dict() if self.device_info else None,
+            'device_info': self.device_info._memoized_dict() if self.device_info else None,
             'file_path': self.file_path,
             'file_size_bytes': self.file_size_bytes,
             'created_timestamp': self.created_timestamp.isoformat() if self.created_timestamp else None,
-            'activity_name': self.get_activity_name(),
-            'duration_formatted': self.get_duration_formatted(),
+            'activity_name': self.activity_name,
+            'duration_formatted': self.duration_formatted,
             'is_complete': self.is_complete()
         }
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Convert metadata to dictionary.
+        
+        The dictionary is built once and reused until a field (or the
+        attached device info) changes; each call returns a copy, so callers
+        may modify it.
+        
+        Returns:
+            Dictionary representation of metadata
+        """
+        cached = self._dict_cache
+        if cached is None or (self.device_info is not None and
+                              cached['device_info'] is not self.device_info._memoized_dict()):
+            cached = self._dict_cache = self._build_dict()
+        result = dict(cached)
+        if result['device_info'] is not None:
+            result['device_info'] = dict(result['device_info'])
+        return result
+
+
+def _format_duration(total_seconds: int) -> str:
+    """
+    Format a whole number of seconds as "Xh Ym", "Xh", "Ym" or "Xs".
+    
+    Args:
+        total_seconds: Duration in whole seconds
+        
+    Returns:
+        Formatted duration string
+    """
+    hours, remainder = divmod(total_seconds, 3600)
+    minutes, seconds = divmod(remainder, 60)
+    if hours:
+        return f"{hours}h {minutes}m" if minutes else f"{hours}h"
+    return f"{minutes}m" if minutes else f"{seconds}s"
+
+
+# Names of the FitFileMetadata slots holding memoized derived values
+_CACHED_METADATA_ATTRS = ('_activity_name', '_duration_formatted', '_dict_cache')
+
+# Constructor fields of FitFileMetadata that merge_metadata() may replace
+_METADATA_FIELDS = frozenset(f.name for f in fields(FitFileMetadata) if f.init)
 
 
 def create_metadata_from_dict(metadata_dict: Dict[str, Any]) -> FitFileMetadata:
@@ -317,14 +417,8 @@ def merge_metadata(base_metadata: FitFileMetadata, additional_data: Dict[str, An
     if not isinstance(additional_data, dict):
         raise TypeError("additional_data must be a dictionary")
     
-    # Create a copy of the base metadata as a dict
-    merged_dict = base_metadata.to_dict()
-    
-    # Update with additional data
-    for key, value in additional_data.items():
-        if key in merged_dict:
-            merged_dict[key] = value
-    
-    # Convert back to FitFileMetadata
-    # Note: This is a simplified conversion - in practice you might want more sophisticated merging
-    return create_metadata_from_dict(merged_dict)
\ No newline at end of file
+    # Copy the base metadata with only the recognised fields replaced; unknown
+    # keys are ignored, as before
+    return replace(base_metadata, **{
+        key: value for key, value in additional_data.items() if key in _METADATA_FIELDS
+    })
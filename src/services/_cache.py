@@ -0,0 +1,110 @@
+"""
+On-disk cache for results derived from FIT files.
+
+Entries are pickled under the user's cache directory and keyed by the FIT
+file's absolute path, modification time and size (plus any other inputs),
+so a file that is edited or replaced is parsed again. Caching is best-effort:
+unreadable or unwritable entries are treated as misses. Set the
+FIT2CAL_CACHE environment variable to 0 to disable it.
+"""
+
+import hashlib
+import os
+import pickle
+import tempfile
+from typing import Any
+
+from src.core.logger import get_logger
+
+# Get logger for this module
+logger = get_logger(__name__)
+
+# Bump when the layout of cached objects changes so old entries are ignored
+_CACHE_VERSION = 4
+
+
+def cache_enabled() -> bool:
+    """
+    Check whether the on-disk cache is enabled.
+
+    Returns:
+        False if FIT2CAL_CACHE is set to 0, True otherwise
+    """
+    return os.environ.get('FIT2CAL_CACHE', '1') != '0'
+
+
+def cache_directory() -> str:
+    """
+    Get the directory holding cache entries.
+
+    Returns:
+        $XDG_CACHE_HOME/fit-file-to-calories, or ~/.cache/fit-file-to-calories
+    """
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'fit-file-to-calories')
+
+
+def file_cache_key(namespace: str, file_path: str, file_stat: os.stat_result, *inputs: Any) -> str:
+    """
+    Build the cache key for a result derived from a file.
+
+    Args:
+        namespace: Name of the cached computation
+        file_path: Path to the source file
+        file_stat: Result of os.stat() for file_path
+        *inputs: Any other values the result depends on
+
+    Returns:
+        Hex digest identifying the cache entry
+    """
+    raw = repr((_CACHE_VERSION, namespace, os.path.abspath(file_path),
+                file_stat.st_mtime_ns, file_stat.st_size, inputs))
+    return hashlib.blake2b(raw.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def load(key: str, default: Any = None) -> Any:
+    """
+    Load a cached value.
+
+    Args:
+        key: Key from file_cache_key()
+        default: Value returned on a cache miss
+
+    Returns:
+        The cached value, or default if there is no usable entry
+    """
+    entry_path = os.path.join(cache_directory(), f"{key}.pkl")
+    try:
+        with open(entry_path, 'rb') as f:
+            return pickle.load(f)
+    except FileNotFoundError:
+        return default
+    except Exception as e:
+        logger.debug("Ignoring unreadable cache entry %s: %s", entry_path, e)
+        return default
+
+
+def store(key: str, value: Any) -> None:
+    """
+    Store a value in the cache.
+
+    The entry is written to a temporary file and moved into place with
+    os.replace, so concurrent readers never see a partial entry.
+
+    Args:
+        key: Key from file_cache_key()
+        value: Picklable value to cache
+    """
+    directory = cache_directory()
+    try:
+        os.makedirs(directory, exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as f:
+                pickle.dump(value, f, protocol=pickle.HIGHEST_PROTOCOL)
+            os.replace(tmp_path, os.path.join(directory, f"{key}.pkl"))
+        except BaseException:
+            os.unlink(tmp_path)
+            raise
+    except Exception as e:
+        logger.debug("Could not write cache entry %s: %s", key, e)
@@ -8,113 +8,173 @@ and file renaming operations.
 import os
 import logging
 from datetime import datetime
-from typing import Dict, Any, Optional
-from fitparse import FitFile
+from typing import TYPE_CHECKING, Dict, Any, Optional, Set, Tuple
 from src.core.logger import get_logger
+from src.services import _cache
+from src.services.fit_processor import open_fit_file
 from src.models.metadata import FitFileMetadata, DeviceInfo, create_metadata_from_dict
 
+if TYPE_CHECKING:
+    from fitparse import FitFile
+
 # Get logger for this module
 logger = get_logger(__name__)
 
+# Message types read by extract_fit_file_metadata in its single pass
+_METADATA_MESSAGE_NAMES = ('device_info', 'session', 'record')
+
+# device_info message fields copied onto DeviceInfo (names match its attributes)
+_DEVICE_INFO_FIELDS = ('manufacturer', 'product', 'serial_number', 'software_version',
+                       'hardware_version', 'device_type', 'battery_status')
+
 
-def extract_fit_file_metadata(file_path: str) -> FitFileMetadata:
+def extract_fit_file_metadata(file_path: str, fitfile: Optional['FitFile'] = None) -> FitFileMetadata:
     """
     Extracts relevant metadata from a FIT file.
     
+    Results are cached on disk keyed by the file's path, modification time
+    and size, so repeated runs over unchanged files skip parsing entirely.
+    Files that fail to parse are not cached, so they are retried next time.
+    
     Args:
         file_path: Path to the FIT file.
+        fitfile: Already opened FitFile for file_path, to avoid parsing it again (optional).
         
     Returns:
         FitFileMetadata object containing extracted metadata
     """
+    # One stat call serves both the cache key and the file size
+    try:
+        file_stat = os.stat(file_path)
+    except OSError:
+        file_stat = None
+    
+    if file_stat is None or not _cache.cache_enabled():
+        return _extract_fit_file_metadata(file_path, fitfile, file_stat)[0]
+    
+    key = _cache.file_cache_key('metadata', file_path, file_stat)
+    metadata = _cache.load(key)
+    if metadata is None:
+        metadata, parsed = _extract_fit_file_metadata(file_path, fitfile, file_stat)
+        if parsed:
+            _cache.store(key, metadata)
+    return metadata
+
+
+def _extract_fit_file_metadata(file_path: str, fitfile: Optional['FitFile'],
+                               file_stat: Optional[os.stat_result]) -> Tuple[FitFileMetadata, bool]:
+    """
+    Parse metadata from a FIT file without consulting the cache.
+    
+    Device, session and record messages are collected in a single pass over
+    the file; record timestamps are only used when the session lacks a start
+    time or duration.
+    
+    Args:
+        file_path: Path to the FIT file.
+        fitfile: Already opened FitFile for file_path, or None to open it.
+        file_stat: Result of os.stat() for file_path, or None if it failed.
+        
+    Returns:
+        Tuple of (FitFileMetadata object, whether the file was parsed). On a
+        parse error the metadata holds defaults for the fields not yet read.
+    """
     # Initialize metadata with defaults
     metadata = FitFileMetadata(
         file_path=file_path,
         created_timestamp=datetime.now()
     )
     
+    # Only close the FitFile if it was opened here
+    opened = fitfile is None
     try:
         # Get file size
-        if os.path.exists(file_path):
-            metadata.file_size_bytes = os.path.getsize(file_path)
+        if file_stat is not None:
+            metadata.file_size_bytes = file_stat.st_size
         
-        fitfile = FitFile(file_path)
+        if fitfile is None:
+            fitfile = open_fit_file(file_path)
+        
+        device = None
+        session = None
+        first_timestamp = None
+        last_timestamp = None
+        for message in fitfile.get_messages(_METADATA_MESSAGE_NAMES):
+            name = message.name
+            if name == 'record':
+                timestamp = message.get_value('timestamp')
+                if timestamp is not None:
+                    if first_timestamp is None or timestamp < first_timestamp:
+                        first_timestamp = timestamp
+                    if last_timestamp is None or timestamp > last_timestamp:
+                        last_timestamp = timestamp
+            elif name == 'device_info':
+                if device is None:
+                    device = message  # Use first device
+            elif name == 'session':
+                if session is None:
+                    session = message  # Assuming one session per file for simplicity
         
         # Extract device information
         device_info = DeviceInfo()
-        device_messages = list(fitfile.get_messages('device_info'))
-        if device_messages:
-            device = device_messages[0]  # Use first device
-            for field in device:
-                if field.name == 'manufacturer':
-                    device_info.manufacturer = str(field.value) if field.value else None
-                elif field.name == 'product':
-                    device_info.product = str(field.value) if field.value else None
-                elif field.name == 'serial_number':
-                    device_info.serial_number = str(field.value) if field.value else None
-                elif field.name == 'software_version':
-                    device_info.software_version = str(field.value) if field.value else None
-                elif field.name == 'hardware_version':
-                    device_info.hardware_version = str(field.value) if field.value else None
-                elif field.name == 'device_type':
-                    device_info.device_type = str(field.value) if field.value else None
-                elif field.name == 'battery_status':
-                    device_info.battery_status = str(field.value) if field.value else None
+        if device is not None:
+            for field_name in _DEVICE_INFO_FIELDS:
+                value = device.get_value(field_name)
+                if value:
+                    setattr(device_info, field_name, str(value))
         
         metadata.device_info = device_info
         
         # Try to get data from session messages first
-        session_messages = list(fitfile.get_messages('session'))
-        if session_messages:
-            session = session_messages[0]  # Assuming one session per file for simplicity
-            for field in session:
-                if field.name == 'start_time':
-                    metadata.start_time = field.value
-                elif field.name == 'total_elapsed_time':
-                    metadata.duration_seconds = float(field.value) if field.value else 0.0
-                elif field.name == 'sport':
-                    metadata.sport = str(field.value).replace('_', ' ').title() if field.value else 'Unknown'
-                elif field.name == 'sub_sport':
-                    metadata.sub_sport = str(field.value).replace('_', ' ').title() if field.value else 'Unknown'
-                elif field.name == 'total_distance':
-                    metadata.total_distance = float(field.value) if field.value else None
-                elif field.name == 'total_calories':
-                    metadata.total_calories = float(field.value) if field.value else None
-                elif field.name == 'avg_heart_rate':
-                    metadata.avg_heart_rate = float(field.value) if field.value else None
-                elif field.name == 'max_heart_rate':
-                    metadata.max_heart_rate = float(field.value) if field.value else None
+        if session is not None:
+            start_time = session.get_value('start_time')
+            if start_time is not None:
+                metadata.start_time = start_time
+            value = session.get_value('total_elapsed_time')
+            metadata.duration_seconds = float(value) if value else 0.0
+            value = session.get_value('sport')
+            metadata.sport = str(value).replace('_', ' ').title() if value else 'Unknown'
+            value = session.get_value('sub_sport')
+            metadata.sub_sport = str(value).replace('_', ' ').title() if value else 'Unknown'
+            value = session.get_value('total_distance')
+            metadata.total_distance = float(value) if value else None
+            value = session.get_value('total_calories')
+            metadata.total_calories = float(value) if value else None
+            value = session.get_value('avg_heart_rate')
+            metadata.avg_heart_rate = float(value) if value else None
+            value = session.get_value('max_heart_rate')
+            metadata.max_heart_rate = float(value) if value else None
         
-        # Fallback to record messages for start_time and duration if session data is missing
-        if metadata.start_time is None or metadata.duration_seconds == 0:
-            record_timestamps = []
-            for record in fitfile.get_messages('record'):
-                for field in record:
-                    if field.name == 'timestamp':
-                        record_timestamps.append(field.value)
-            
-            if record_timestamps:
-                record_timestamps.sort()
-                if metadata.start_time is None:
-                    metadata.start_time = record_timestamps[0]
-                if metadata.duration_seconds == 0 and len(record_timestamps) > 1:
-                    metadata.duration_seconds = (record_timestamps[-1] - record_timestamps[0]).total_seconds()
-                    metadata.end_time = record_timestamps[-1]
+        # Fallback to record timestamps for start_time and duration if session data is missing
+        if first_timestamp is not None:
+            if metadata.start_time is None:
+                metadata.start_time = first_timestamp
+            if metadata.duration_seconds == 0 and last_timestamp > first_timestamp:
+                metadata.duration_seconds = (last_timestamp - first_timestamp).total_seconds()
+                metadata.end_time = last_timestamp
                     
     except Exception as e:
         logger.error(f"Error extracting metadata from {file_path}: {e}")
         # Keep default metadata values in case of error
+        return metadata, False
+    finally:
+        if opened and fitfile is not None:
+            fitfile.close()
         
-    return metadata
+    return metadata, True
 
 
-def rename_fit_file(original_file_path: str, metadata: FitFileMetadata) -> Optional[str]:
+def rename_fit_file(original_file_path: str, metadata: FitFileMetadata,
+                    existing_names: Optional[Set[str]] = None) -> Optional[str]:
     """
     Renames a FIT file based on extracted metadata.
     
     Args:
         original_file_path: The current path of the FIT file.
         metadata: FitFileMetadata object containing metadata.
+        existing_names: Names of the files in the file's directory (optional).
+            Batch callers can list the directory once and pass the set here
+            to avoid per-file directory checks; it is updated after a rename.
         
     Returns:
         The new file path if successful, None otherwise.
@@ -125,9 +185,9 @@ def rename_fit_file(original_file_path: str, metadata: FitFileMetadata) -> Optio
         logger.warning(f"Could not determine start time for {original_filename}. Skipping rename.")
         return None
         
-    # Format date and time
-    date_str = metadata.start_time.strftime('%Y-%m-%d')
-    time_str = metadata.start_time.strftime('%H%M')
+    # Format date and time (attribute formatting avoids two strftime calls)
+    start_time = metadata.start_time
+    date_time_str = f"{start_time.year:04d}-{start_time.month:02d}-{start_time.day:02d}_{start_time.hour:02d}{start_time.minute:02d}"
     
     # Use the formatted activity name from metadata
     activity_type = metadata.get_activity_name()
@@ -136,7 +196,7 @@ def rename_fit_file(original_file_path: str, metadata: FitFileMetadata) -> Optio
     duration_str = metadata.get_duration_formatted()
     
     # Construct new filename
-    new_filename_base = f"{date_str}_{time_str}_{activity_type}"
+    new_filename_base = f"{date_time_str}_{activity_type}"
     if duration_str and duration_str != "0s":
         new_filename_base += f"_{duration_str}"
         
@@ -144,15 +204,27 @@ def rename_fit_file(original_file_path: str, metadata: FitFileMetadata) -> Optio
     new_file_path = os.path.join(directory, new_filename)
     
     # Handle potential naming conflicts
-    counter = 1
-    while os.path.exists(new_file_path) and new_file_path != original_file_path:
-        new_filename = f"{new_filename_base}_{counter}.fit"
-        new_file_path = os.path.join(directory, new_filename)
-        counter += 1
+    if existing_names is None and new_file_path != original_file_path and os.path.exists(new_file_path):
+        # The preferred name is taken: list the directory once and probe the
+        # numbered alternatives in memory instead of stat-ing each candidate
+        try:
+            existing_names = set(os.listdir(directory or os.curdir))
+        except OSError as e:
+            logger.error(f"Error listing directory for '{original_filename}': {e}")
+            return None
+    if existing_names is not None:
+        counter = 1
+        while new_filename in existing_names and new_file_path != original_file_path:
+            new_filename = f"{new_filename_base}_{counter}.fit"
+            new_file_path = os.path.join(directory, new_filename)
+            counter += 1
         
     try:
         if original_file_path != new_file_path:
             os.rename(original_file_path, new_file_path)
+            if existing_names is not None:
+                existing_names.discard(original_filename)
+                existing_names.add(new_filename)
             logger.info(f"Renamed '{original_filename}' to '{new_filename}'")
             return new_file_path
         else:
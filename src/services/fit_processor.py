@@ -6,39 +6,163 @@ to calculate calories burned during activities.
 """
 
 import logging
+import mmap
+import os
+from array import array
+from dataclasses import replace
 from datetime import datetime
-from typing import List, Tuple
-from fitparse import FitFile
+from functools import lru_cache
+from itertools import compress, islice, repeat
+from math import isnan
+from operator import add, and_, floordiv, ge, gt, itemgetter, le, mul, not_, sub, truediv
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 from src.core.logger import get_logger
-from src.core.utils import calories_burned
-from src.models.fit_data import HeartRateData, CalorieData, ProcessingResult, create_heart_rate_data_from_tuples, calculate_average_heart_rate, calculate_total_duration
+from src.core.utils import keytel_coefficients
+from src.services import _cache
+from src.models._common import _NUMBER_TYPES
+from src.models.fit_data import HeartRateData, HeartRateSeries, CalorieData, ProcessingResult, summarize_heart_rate_data, compact_heart_rates, epoch_seconds_column
 from src.validators.input_validator import validate_heart_rate_data, validate_calculation_inputs
 from src.exceptions import FitFileError, InvalidFitFileError, MissingDataError, InputValidationError
 
+# fitparse is imported inside the functions that parse FIT files so that
+# importing this module (e.g. for the CLI menu) does not load it
+if TYPE_CHECKING:
+    from fitparse import FitFile
+
 # Get logger for this module
 logger = get_logger(__name__)
 
 
-def extract_heart_rate_data(fitfile) -> List[Tuple[datetime, int]]:
+# Segment length, in samples, that integrate_calories_adaptive starts from
+_ADAPTIVE_START_STEP = 64
+
+# Read buffer for FIT files that are not memory-mapped (default is 8 KiB)
+_READ_BUFFER_SIZE = 1 << 20
+
+# Files at least this large are memory-mapped; smaller ones fit in one buffered read
+_MMAP_MIN_SIZE = 4 * 1024 * 1024
+
+
+def open_fit_file(file_path: str) -> 'FitFile':
     """
-    Extract (timestamp, heart_rate) tuples from a FitFile object or a mock.
+    Open a FIT file for parsing.
+    
+    fitparse issues many small reads while decoding. Typical activity files
+    are well under a megabyte, so they are read through a 1 MiB buffer that
+    serves those reads after a single read() syscall. Files of 4 MiB or more
+    are mapped read-only instead, which avoids copying them into the buffer
+    and lets the OS page cache share them between worker processes. Closing
+    the returned FitFile releases the map or file.
     
     Args:
-        fitfile: A FitFile object or mock containing heart rate data
+        file_path: Path to the FIT file
         
     Returns:
-        A list of (timestamp, heart_rate) tuples sorted by timestamp
+        FitFile object reading from the buffered or mapped file
+    """
+    from fitparse import FitFile
+    
+    try:
+        f = open(file_path, 'rb', buffering=_READ_BUFFER_SIZE)
+    except OSError:
+        # Let fitparse open the path and report the error
+        return FitFile(file_path)
+    
+    if os.fstat(f.fileno()).st_size < _MMAP_MIN_SIZE:
+        # Mapping costs more to set up than it saves on small files
+        return FitFile(f)
+    
+    try:
+        buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    except (OSError, ValueError):
+        # Unmappable files: read through the large buffer instead, so
+        # fitparse's small reads don't each turn into a read() syscall
+        return FitFile(f)
+    f.close()
+    
+    # The FitFile owns the map from here on, including when parsing the
+    # header fails (fitparse closes its file object when collected)
+    return FitFile(buffer)
+
+
+def _read_record_fields(record, debug_enabled: bool = False) -> Tuple[Any, Any]:
+    """
+    Read the raw timestamp and heart rate values from a record-like object.
+    
+    Used for records that are not fitparse DataMessages (e.g. mocks), which
+    are iterated field by field.
+    
+    Args:
+        record: An iterable of objects with name and value attributes
+        debug_enabled: Whether debug logging is enabled, checked once by the caller
+        
+    Returns:
+        Tuple of (timestamp, heart_rate) values, either of which may be None
+    """
+    timestamp = None
+    hr = None
+    
+    # Always call __iter__ to get fields; handle mocks with instance-level __iter__
+    try:
+        iter_func = getattr(record, '__iter__')
+        fields = list(iter_func(record))
+    except (AttributeError, TypeError) as e:
+        if debug_enabled:
+            logger.debug("Could not use instance __iter__: %s", e)
+        try:
+            fields = list(iter(record))
+        except (TypeError, ValueError) as e:
+            if debug_enabled:
+                logger.debug("Could not iterate record: %s", e)
+            fields = [record]
+    
+    if debug_enabled:
+        logger.debug("fields: %s", fields)
+    
+    # One try around the whole scan rather than one per field; a field whose
+    # attributes raise ends the scan with whatever was found before it
+    try:
+        for field in fields:
+            name = getattr(field, 'name', None)
+            if debug_enabled:
+                logger.debug("field: %s, name: %s, value: %s", field, name, getattr(field, 'value', None))
+            
+            if name == 'timestamp':
+                timestamp = getattr(field, 'value', None)
+            elif name == 'heart_rate':
+                hr = getattr(field, 'value', None)
+            else:
+                continue
+            
+            # The remaining fields (cadence, power, ...) are not needed
+            if timestamp is not None and hr is not None:
+                break
+    except Exception as e:
+        logger.warning("Error processing field %s: %s", field, e)
+    
+    return timestamp, hr
+
+
+def _iter_heart_rate_samples(fitfile) -> Iterator[Tuple[datetime, Union[int, float]]]:
+    """
+    Yield valid (timestamp, heart_rate) pairs from a FitFile object or a mock.
+    
+    Records missing either value, or with invalid values, are skipped.
+    
+    Args:
+        fitfile: A FitFile object or mock containing heart rate data
+        
+    Yields:
+        (timestamp, heart_rate) pairs in file order
         
     Raises:
         TypeError: If fitfile is not a valid FitFile object or mock
-        AttributeError: If required methods are missing from fitfile
-        MissingDataError: If no valid heart rate data is found
-        ValueError: If data values are invalid
+        FitFileError: If the records cannot be read
     """
     if fitfile is None:
         raise TypeError("FitFile object cannot be None")
     
-    heart_rate_data = []
+    from fitparse import DataMessage
     
     try:
         records = fitfile.get_messages('record')
@@ -49,142 +173,314 @@ def extract_heart_rate_data(fitfile) -> List[Tuple[datetime, int]]:
         logger.error(f"Error accessing FIT file records: {e}")
         raise FitFileError(f"Error accessing FIT file records: {e}") from e
     
+    # Checked once so disabled debug logging costs nothing per record
+    debug_enabled = logger.isEnabledFor(logging.DEBUG)
+    
     for record in records:
-        logger.debug(f"record: {record}")
-        timestamp = None
-        hr = None
+        if debug_enabled:
+            logger.debug("record: %s", record)
         
-        # Always call __iter__ to get fields; handle mocks with instance-level __iter__
-        try:
-            iter_func = getattr(record, '__iter__')
-            fields = list(iter_func(record))
-        except (AttributeError, TypeError) as e:
-            logger.debug(f"Could not use instance __iter__: {e}")
-            try:
-                fields = list(iter(record))
-            except (TypeError, ValueError) as e:
-                logger.debug(f"Could not iterate record: {e}")
-                fields = [record]
+        if isinstance(record, DataMessage):
+            # Real fitparse records: look the two fields up directly instead
+            # of iterating every field
+            timestamp = record.get_value('timestamp')
+            hr = record.get_value('heart_rate')
+        else:
+            timestamp, hr = _read_record_fields(record, debug_enabled)
         
-        logger.debug(f"fields: {fields}")
-        
-        for field in fields:
-            try:
-                name = getattr(field, 'name', None)
-                value = getattr(field, 'value', None)
-                logger.debug(f"field: {field}, name: {name}, value: {value}")
-                
-                if name == 'timestamp':
-                    if not isinstance(value, datetime):
-                        logger.warning(f"Invalid timestamp format: {value}")
-                        continue
-                    timestamp = value
-                elif name == 'heart_rate':
-                    if not isinstance(value, (int, float)) or value <= 0:
-                        logger.warning(f"Invalid heart rate value: {value}")
-                        continue
-                    hr = value
-            except Exception as e:
-                logger.warning(f"Error processing field {field}: {e}")
-                continue
+        if timestamp is not None and not isinstance(timestamp, datetime):
+            logger.warning(f"Invalid timestamp format: {timestamp}")
+            timestamp = None
+        if hr is not None and (not isinstance(hr, (int, float)) or not 0 < hr <= 250):
+            logger.warning(f"Invalid heart rate value: {hr}")
+            hr = None
                 
-        logger.debug(f"extracted timestamp: {timestamp}, hr: {hr}")
+        if debug_enabled:
+            logger.debug("extracted timestamp: %s, hr: %s", timestamp, hr)
         
         if hr is not None and timestamp is not None:
-            heart_rate_data.append((timestamp, hr))
+            yield timestamp, hr
+
+
+def extract_heart_rate_data(fitfile) -> List[Tuple[datetime, int]]:
+    """
+    Extract (timestamp, heart_rate) tuples from a FitFile object or a mock.
     
-    logger.debug(f"heart_rate_data: {heart_rate_data}")
+    Args:
+        fitfile: A FitFile object or mock containing heart rate data
+        
+    Returns:
+        A list of (timestamp, heart_rate) tuples sorted by timestamp
+        
+    Raises:
+        TypeError: If fitfile is not a valid FitFile object or mock
+        AttributeError: If required methods are missing from fitfile
+        MissingDataError: If no valid heart rate data is found
+        ValueError: If data values are invalid
+    """
+    heart_rate_data = []
+    is_sorted = True
+    last_timestamp = None
+    
+    for sample in _iter_heart_rate_samples(fitfile):
+        timestamp = sample[0]
+        if last_timestamp is not None and timestamp < last_timestamp:
+            is_sorted = False
+        last_timestamp = timestamp
+        heart_rate_data.append(sample)
+    
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("heart_rate_data: %s", heart_rate_data)
     
     if not heart_rate_data:
         logger.error("No valid heart rate data found in FIT file")
         raise MissingDataError("No valid heart rate data found in FIT file")
+    
+    # FIT devices record messages chronologically, so only sort when the
+    # single pass above actually saw a timestamp go backwards
+    if not is_sorted:
+        heart_rate_data.sort(key=itemgetter(0))
+        
+    return heart_rate_data
+
+
+def extract_heart_rate_series(fitfile) -> HeartRateSeries:
+    """
+    Extract heart rate samples from a FitFile object or a mock as columns.
+    
+    Timestamps are converted to epoch seconds once, at extraction, and the
+    samples are returned as a timestamp array and a heart rate array.
+    
+    Args:
+        fitfile: A FitFile object or mock containing heart rate data
         
-    return sorted(heart_rate_data, key=lambda x: x[0])
+    Returns:
+        HeartRateSeries sorted by timestamp
+        
+    Raises:
+        TypeError: If fitfile is not a valid FitFile object or mock
+        MissingDataError: If no valid heart rate data is found
+    """
+    samples = list(_iter_heart_rate_samples(fitfile))
+    
+    if not samples:
+        logger.error("No valid heart rate data found in FIT file")
+        raise MissingDataError("No valid heart rate data found in FIT file")
+    
+    # Convert every timestamp to epoch seconds in one batch, so the rest of
+    # the pipeline does plain float arithmetic instead of timedelta objects
+    timestamps = epoch_seconds_column(list(map(itemgetter(0), samples)))
+    try:
+        # Devices report whole beats per minute, which fit a byte column
+        # directly; integration promotes them to floats as it reads them
+        heart_rates = array('B', map(itemgetter(1), samples))
+    except (TypeError, OverflowError):
+        heart_rates = compact_heart_rates(array('d', map(itemgetter(1), samples)))
+    del samples
+    
+    return HeartRateSeries(timestamps=timestamps, heart_rates=heart_rates).sorted_by_time()
+
+
+def _usable_intervals(timestamps, heart_rates) -> Tuple[List[float], List[float]]:
+    """
+    Get the length and average heart rate of each usable sample interval.
+    
+    Interval lengths, average heart rates and the usable-interval mask are
+    built as whole columns with map() rather than a loop per interval.
+    
+    Args:
+        timestamps: Sample times in epoch seconds, sorted ascending
+        heart_rates: Heart rates in beats per minute, parallel to timestamps
+        
+    Returns:
+        Tuple of (interval lengths in minutes, average heart rates) for the
+        usable intervals
+    """
+    minutes = list(map(truediv, map(sub, islice(timestamps, 1, None), timestamps), repeat(60.0)))
+    avg_hrs = list(map(truediv, map(add, islice(heart_rates, 1, None), heart_rates), repeat(2.0)))
+    
+    # Usable intervals last at least 0.01 minutes (which also rules out
+    # non-positive gaps) and have a realistic average heart rate. Usually
+    # every interval is usable, which a few reductions confirm without
+    # building the per-interval mask (NaN slips past min/max, so it is
+    # checked separately).
+    if (minutes and min(minutes) >= 0.01 and min(avg_hrs) > 0 and max(avg_hrs) <= 250
+            and not any(map(isnan, avg_hrs))):
+        return minutes, avg_hrs
+    
+    usable = list(map(and_, map(ge, minutes, repeat(0.01)),
+                      map(and_, map(gt, avg_hrs, repeat(0)), map(le, avg_hrs, repeat(250)))))
+    if not all(usable):
+        _log_skipped_intervals(minutes, avg_hrs, usable)
+        minutes = list(compress(minutes, usable))
+        avg_hrs = list(compress(avg_hrs, usable))
+    
+    return minutes, avg_hrs
+
+
+def _kcal_rate_terms(weight: float, age: float, gender: str) -> Tuple[float, float]:
+    """
+    Reduce the Keytel formula for one user profile to a linear function of heart rate.
+    
+    Everything in the formula except the heart rate term is fixed for the
+    profile, so kcal/min is kcal_per_min_base + kcal_per_bpm * hr.
+    
+    Args:
+        weight: Validated weight in kg
+        age: Validated age in years
+        gender: Normalized gender ('male' or 'female')
+        
+    Returns:
+        Tuple of (kcal_per_min_base, kcal_per_bpm)
+    """
+    base, hr_coef, weight_coef, age_coef, conversion = keytel_coefficients(gender)
+    return (base + weight_coef * weight + age_coef * age) / conversion, hr_coef / conversion
+
+
+@lru_cache(maxsize=32)
+def make_integrator(weight: float, age: float, gender: str) -> Callable[[Sequence[float], Sequence[float]], Tuple[float, int]]:
+    """
+    Build a calorie integrator specialised to one user profile.
+    
+    The Keytel coefficients for the gender and the weight and age terms are
+    resolved once and captured by the returned function. Integrators are
+    cached per profile, so a batch of files for the same user (in one
+    process) builds it only once.
+    
+    Args:
+        weight: Validated weight in kg
+        age: Validated age in years
+        gender: Normalized gender ('male' or 'female')
+        
+    Returns:
+        Function taking (timestamps, heart_rates) columns and returning a
+        tuple of (total calories, number of intervals used)
+    """
+    kcal_per_min_base, kcal_per_bpm = _kcal_rate_terms(weight, age, gender)
+    
+    def integrate(timestamps: Sequence[float], heart_rates: Sequence[float]) -> Tuple[float, int]:
+        minutes, avg_hrs = _usable_intervals(timestamps, heart_rates)
+        # The sum of (kcal_per_min_base + kcal_per_bpm * avg_hr) * minutes is
+        # linear in heart rate, so it reduces to two sums over the intervals
+        total_calories = kcal_per_min_base * sum(minutes) + kcal_per_bpm * sum(map(mul, avg_hrs, minutes))
+        return total_calories, len(minutes)
+    
+    return integrate
+
+
+def _log_skipped_intervals(minutes: List[float], avg_hrs: List[float], usable: List[bool]) -> None:
+    """
+    Log why each unusable interval is left out of the calorie total.
+    
+    Args:
+        minutes: Interval lengths in minutes
+        avg_hrs: Average heart rate of each interval
+        usable: Whether each interval is used
+    """
+    for i in compress(range(len(usable)), map(not_, usable)):
+        delta_minutes = minutes[i]
+        if delta_minutes <= 0:
+            logger.warning(f"Invalid time interval between samples {i} and {i + 1}. Skipping.")
+        elif delta_minutes < 0.01:  # Less than 1 second
+            logger.debug("Skipping very short interval: %s minutes", delta_minutes)
+        else:
+            logger.warning(f"Unrealistic heart rate: {avg_hrs[i]}. Skipping.")
 
 
-def integrate_calories_over_intervals(heart_rate_data: List[Tuple[datetime, int]],
+def integrate_calories_over_intervals(heart_rate_data: Union[List[Tuple[datetime, int]], HeartRateSeries],
                                      weight: float,
                                      age: float,
-                                     gender: str) -> CalorieData:
+                                     gender: str,
+                                     decimate: int = 1,
+                                     _validated: bool = False) -> CalorieData:
     """
     Integrate calories burned over heart rate intervals.
     
+    Each interval uses the mean of its two endpoint heart rates (the
+    trapezoidal rule), whose error for a smoothly varying heart rate grows
+    with the square of the sample spacing. Integrating only every few samples
+    of a densely recorded activity therefore does proportionally less work
+    for a small loss of accuracy; abrupt heart rate changes between kept
+    samples are what it misses. Average heart rate and duration always use
+    every sample.
+    
     Args:
-        heart_rate_data: List of (timestamp, heart_rate) tuples sorted by timestamp
+        heart_rate_data: List of (timestamp, heart_rate) tuples sorted by
+                         timestamp, or a HeartRateSeries
         weight: User's weight in kg
         age: User's age in years
         gender: User's gender ('male' or 'female')
+        decimate: Integrate over every decimate-th sample (plus the last one)
+                  instead of every sample; 1 uses all samples
+        _validated: Internal flag set when the inputs were already validated
+                    (normalized weight, age and gender, and heart rate data
+                    from the extract functions), skipping a second pass
         
     Returns:
         CalorieData object containing calculation results
         
     Raises:
         InputValidationError: If input parameters are invalid
-        ValueError: If heart_rate_data has fewer than 2 entries
+        ValueError: If heart_rate_data has fewer than 2 entries or decimate
+                    is not a positive integer
         TypeError: If input data types are incorrect
     """
-    # Validate input parameters using validators
-    try:
-        validated_inputs = validate_calculation_inputs(
-            weight=weight,
-            age=age,
-            gender=gender
-        )
-        weight = validated_inputs['weight']
-        age = validated_inputs['age']
-        gender = validated_inputs['gender']
-    except InputValidationError as e:
-        raise ValueError(f"Input validation failed: {e}") from e
-    
-    # Validate heart rate data
-    try:
-        validated_hr_data = validate_heart_rate_data(heart_rate_data)
-    except InputValidationError as e:
-        raise ValueError(f"Heart rate data validation failed: {e}") from e
+    if not isinstance(decimate, int) or decimate < 1:
+        raise ValueError(f"decimate must be a positive integer, got {decimate}")
+        
+    if not _validated:
+        # Validate input parameters using validators
+        try:
+            validated_inputs = validate_calculation_inputs(
+                weight=weight,
+                age=age,
+                gender=gender
+            )
+            weight = validated_inputs['weight']
+            age = validated_inputs['age']
+            gender = validated_inputs['gender']
+        except InputValidationError as e:
+            raise ValueError(f"Input validation failed: {e}") from e
+        
+        # Validate heart rate data
+        try:
+            if isinstance(heart_rate_data, HeartRateSeries):
+                heart_rate_data.validate()
+            else:
+                heart_rate_data = validate_heart_rate_data(heart_rate_data)
+        except (InputValidationError, ValueError) as e:
+            raise ValueError(f"Heart rate data validation failed: {e}") from e
     
-    if len(validated_hr_data) < 2:
+    if len(heart_rate_data) < 2:
         raise ValueError("At least two heart rate data points are required")
     
-    total_calories = 0.0
-    intervals_processed = 0
+    # Work on columns so interval arithmetic runs on epoch seconds instead of
+    # creating a timedelta per interval
+    if isinstance(heart_rate_data, HeartRateSeries):
+        series = heart_rate_data
+    else:
+        series = HeartRateSeries.from_tuples(heart_rate_data)
+    
+    timestamps = series.timestamps
+    heart_rates = series.heart_rates
+    if decimate > 1:
+        # Keep the last sample too so the integral still spans the whole activity
+        last = len(series) - 1
+        timestamps = timestamps[::decimate]
+        heart_rates = heart_rates[::decimate]
+        if last % decimate:
+            timestamps.append(series.timestamps[last])
+            heart_rates.append(series.heart_rates[last])
     
     try:
-        for i in range(1, len(validated_hr_data)):
-            prev_ts, prev_hr = validated_hr_data[i - 1]
-            curr_ts, curr_hr = validated_hr_data[i]
-            
-            # Check for negative time intervals
-            if curr_ts <= prev_ts:
-                logger.warning(f"Invalid time interval: {prev_ts} to {curr_ts}. Skipping.")
-                continue
-                
-            delta_minutes = (curr_ts - prev_ts).total_seconds() / 60.0
-            
-            # Skip very short intervals
-            if delta_minutes < 0.01:  # Less than 1 second
-                logger.debug(f"Skipping very short interval: {delta_minutes} minutes")
-                continue
-                
-            avg_hr = (prev_hr + curr_hr) / 2.0
-            
-            # Skip unrealistic heart rates (additional check beyond validation)
-            if avg_hr <= 0 or avg_hr > 250:
-                logger.warning(f"Unrealistic heart rate: {avg_hr}. Skipping.")
-                continue
-                
-            interval_calories = calories_burned(avg_hr, delta_minutes, weight, age, gender)
-            total_calories += interval_calories
-            intervals_processed += 1
-            logger.debug(f"Interval: {delta_minutes:.2f} min, HR: {avg_hr:.1f}, Calories: {interval_calories:.2f}")
-            
+        integrate = make_integrator(weight, age, gender)
+        total_calories, intervals_processed = integrate(timestamps, heart_rates)
     except (TypeError, ValueError) as e:
         logger.error(f"Error calculating calories: {e}")
         raise
     
     # Calculate statistics
-    heart_rates = [hr for _, hr in validated_hr_data]
-    average_heart_rate = sum(heart_rates) / len(heart_rates)
-    duration_minutes = calculate_total_duration(create_heart_rate_data_from_tuples(validated_hr_data))
+    average_heart_rate, duration_minutes = summarize_heart_rate_data(series)
     
     # Create and return CalorieData object
     return CalorieData(
@@ -198,6 +494,246 @@ def integrate_calories_over_intervals(heart_rate_data: List[Tuple[datetime, int]
     )
 
 
+def _segment_calories(timestamps, heart_rates, starts: List[int], ends: List[int],
+                      kcal_per_min_base: float, kcal_per_bpm: float) -> List[float]:
+    """
+    Estimate the calories of each segment from its two endpoint samples.
+    
+    Args:
+        timestamps: Sample times in epoch seconds, sorted ascending
+        heart_rates: Heart rates in beats per minute, parallel to timestamps
+        starts: Index of the first sample of each segment
+        ends: Index of the last sample of each segment
+        kcal_per_min_base: kcal/min at zero heart rate for the profile
+        kcal_per_bpm: kcal/min added per beat per minute
+        
+    Returns:
+        Trapezoidal calorie estimate of each segment
+    """
+    minutes = map(truediv, map(sub, map(timestamps.__getitem__, ends), map(timestamps.__getitem__, starts)),
+                  repeat(60.0))
+    avg_hrs = map(truediv, map(add, map(heart_rates.__getitem__, starts), map(heart_rates.__getitem__, ends)),
+                  repeat(2.0))
+    kcal_per_min = map(add, repeat(kcal_per_min_base), map(mul, repeat(kcal_per_bpm), avg_hrs))
+    return list(map(mul, kcal_per_min, minutes))
+
+
+def _integrate_segments_adaptive(timestamps, heart_rates, last: int, eps: float,
+                                 kcal_per_min_base: float, kcal_per_bpm: float) -> Tuple[Optional[float], int]:
+    """
+    Integrate calories by halving segments until each agrees with its halves.
+    
+    Args:
+        timestamps: Sample times in epoch seconds, sorted ascending
+        heart_rates: Heart rates in beats per minute, parallel to timestamps
+        last: Index of the last sample
+        eps: Relative tolerance between a segment and its two halves
+        kcal_per_min_base: kcal/min at zero heart rate for the profile
+        kcal_per_bpm: kcal/min added per beat per minute
+        
+    Returns:
+        Tuple of (total calories, number of segments used), or (None, 0) if
+        at some level most segments disagreed with their halves while more
+        than a quarter of the intervals were still unsettled
+    """
+    starts = list(range(0, last, _ADAPTIVE_START_STEP))
+    ends = list(map(min, map(add, starts, repeat(_ADAPTIVE_START_STEP)), repeat(last)))
+    estimates = _segment_calories(timestamps, heart_rates, starts, ends, kcal_per_min_base, kcal_per_bpm)
+    leaf_starts: List[int] = []
+    leaf_ends: List[int] = []
+    leaf_estimates: List[float] = []
+    
+    total_calories = 0.0
+    segments_used = 0
+    while starts:
+        # Single intervals cannot be split; they are integrated exactly below
+        splittable = list(map(gt, map(sub, ends, starts), repeat(1)))
+        if not all(splittable):
+            leaf_starts += compress(starts, map(not_, splittable))
+            leaf_ends += compress(ends, map(not_, splittable))
+            leaf_estimates += compress(estimates, map(not_, splittable))
+            starts = list(compress(starts, splittable))
+            ends = list(compress(ends, splittable))
+            estimates = list(compress(estimates, splittable))
+            if not starts:
+                break
+        
+        # Both halves hold at least one interval, so every comparison is real
+        mids = list(map(floordiv, map(add, starts, ends), repeat(2)))
+        left = _segment_calories(timestamps, heart_rates, starts, mids, kcal_per_min_base, kcal_per_bpm)
+        right = _segment_calories(timestamps, heart_rates, mids, ends, kcal_per_min_base, kcal_per_bpm)
+        refined = list(map(add, left, right))
+        
+        # Segments whose halves agree with the whole are final; the rest are
+        # split, carrying the halves' estimates into the next comparison
+        settled = list(map(le, map(abs, map(sub, refined, estimates)),
+                           map(mul, map(abs, refined), repeat(eps))))
+        settled_refined = list(compress(refined, settled))
+        total_calories += sum(settled_refined)
+        segments_used += len(settled_refined)
+        
+        unsettled = list(map(not_, settled))
+        starts, ends = (list(compress(starts, unsettled)) + list(compress(mids, unsettled)),
+                        list(compress(mids, unsettled)) + list(compress(ends, unsettled)))
+        estimates = list(compress(left, unsettled)) + list(compress(right, unsettled))
+        
+        if len(settled_refined) * 2 < len(settled) and sum(map(sub, ends, starts)) * 4 > last:
+            # Most segments disagreed and a large part of the activity is
+            # left: refining it would cost more than integrating every interval
+            return None, 0
+    
+    # As in integrate_calories_over_intervals, single intervals shorter than
+    # 0.01 minutes are left out
+    minutes = map(truediv, map(sub, map(timestamps.__getitem__, leaf_ends), map(timestamps.__getitem__, leaf_starts)),
+                  repeat(60.0))
+    intervals = list(compress(leaf_estimates, map(ge, minutes, repeat(0.01))))
+    return total_calories + sum(intervals), segments_used + len(intervals)
+
+
+def integrate_calories_adaptive(heart_rate_data: Union[List[Tuple[datetime, int]], HeartRateSeries],
+                                weight: float,
+                                age: float,
+                                gender: str,
+                                eps: float = 1e-3) -> CalorieData:
+    """
+    Integrate calories, refining only the parts of an activity that need it.
+    
+    The activity is split into segments of 64 samples (the last one may be
+    shorter), each estimated by the trapezoidal rule over its two endpoints.
+    Every segment is then compared with the sum of its two halves, split at
+    its middle sample: where the two agree to within eps (relative to the
+    halves), the halves' sum is kept; elsewhere each half becomes a segment
+    of its own, reusing its estimate from this comparison, and the process
+    repeats down to single sample intervals. Steady stretches settle after a
+    few comparisons, so long, even efforts are integrated from a fraction of
+    their samples, while stretches with changing heart rate are integrated
+    at full resolution. When most segments at a level disagree with their
+    halves while more than a quarter of the activity is still unsettled
+    (heart rate that varies from sample to sample), or the activity has no
+    more than 128 intervals, every interval is integrated directly instead,
+    as integrate_calories_over_intervals does.
+    
+    A segment is only judged by its endpoints and middle sample, so a short
+    burst that falls entirely between those samples of an otherwise steady
+    segment is never seen and is integrated as if heart rate stayed steady.
+    Use integrate_calories_over_intervals when such bursts must count.
+    
+    Intervals shorter than 0.01 minutes are only left out once a segment is
+    refined down to single samples; FIT timestamps have whole-second
+    resolution, so such intervals only occur as zero-length duplicates, which
+    contribute nothing either way.
+    
+    Args:
+        heart_rate_data: List of (timestamp, heart_rate) tuples sorted by
+                         timestamp, or a HeartRateSeries
+        weight: User's weight in kg
+        age: User's age in years
+        gender: User's gender ('male' or 'female')
+        eps: Relative tolerance between a segment and its two halves
+        
+    Returns:
+        CalorieData object; intervals_processed counts the segments whose
+        estimates make up the total
+        
+    Raises:
+        ValueError: If inputs are invalid, heart_rate_data has fewer than 2
+                    entries, or eps is not positive
+    """
+    if not isinstance(eps, _NUMBER_TYPES) or not eps > 0:
+        raise ValueError(f"eps must be a positive number, got {eps}")
+    
+    try:
+        validated_inputs = validate_calculation_inputs(weight=weight, age=age, gender=gender)
+    except InputValidationError as e:
+        raise ValueError(f"Input validation failed: {e}") from e
+    weight = validated_inputs['weight']
+    age = validated_inputs['age']
+    gender = validated_inputs['gender']
+    
+    try:
+        if isinstance(heart_rate_data, HeartRateSeries):
+            heart_rate_data.validate()
+            series = heart_rate_data
+        else:
+            series = HeartRateSeries.from_tuples(validate_heart_rate_data(heart_rate_data))
+    except (InputValidationError, ValueError) as e:
+        raise ValueError(f"Heart rate data validation failed: {e}") from e
+    
+    if len(series) < 2:
+        raise ValueError("At least two heart rate data points are required")
+    
+    timestamps = series.timestamps
+    heart_rates = series.heart_rates
+    
+    last = len(series) - 1
+    if last <= 2 * _ADAPTIVE_START_STEP:
+        # Too few intervals for coarse segments to save any work
+        total_calories, segments_used = make_integrator(weight, age, gender)(timestamps, heart_rates)
+    else:
+        kcal_per_min_base, kcal_per_bpm = _kcal_rate_terms(weight, age, gender)
+        total_calories, segments_used = _integrate_segments_adaptive(
+            timestamps, heart_rates, last, eps, kcal_per_min_base, kcal_per_bpm
+        )
+        if total_calories is None:
+            # Heart rate varies from sample to sample over much of the
+            # activity: integrating every interval directly is cheaper than
+            # halving the remaining segments level by level
+            total_calories, segments_used = make_integrator(weight, age, gender)(timestamps, heart_rates)
+    
+    # Statistics always use every sample, computed once
+    average_heart_rate, duration_minutes = summarize_heart_rate_data(series)
+    
+    return CalorieData(
+        total_calories=total_calories,
+        average_heart_rate=average_heart_rate,
+        duration_minutes=duration_minutes,
+        weight=weight,
+        age=age,
+        gender=gender,
+        intervals_processed=segments_used
+    )
+
+
+def integrate_calories_range(heart_rate_series: HeartRateSeries,
+                             start: datetime,
+                             end: datetime,
+                             weight: float,
+                             age: float,
+                             gender: str) -> CalorieData:
+    """
+    Integrate calories over the part of an activity between two times.
+    
+    The samples from start to end (inclusive) are located by binary search,
+    so querying a lap of a long activity only touches that lap's samples.
+    
+    Args:
+        heart_rate_series: HeartRateSeries sorted by timestamp, as returned by
+                           extract_heart_rate_series
+        start: Start of the range
+        end: End of the range
+        weight: User's weight in kg
+        age: User's age in years
+        gender: User's gender ('male' or 'female')
+        
+    Returns:
+        CalorieData object for the samples in the range
+        
+    Raises:
+        TypeError: If heart_rate_series is not a HeartRateSeries or a bound
+                   is not a datetime
+        ValueError: If inputs are invalid, start is after end, or fewer than
+                    two samples fall in the range
+    """
+    if not isinstance(heart_rate_series, HeartRateSeries):
+        raise TypeError("heart_rate_series must be a HeartRateSeries")
+    if not isinstance(start, datetime) or not isinstance(end, datetime):
+        raise TypeError("start and end must be datetime objects")
+    if start > end:
+        raise ValueError(f"start ({start}) must not be after end ({end})")
+    
+    return integrate_calories_over_intervals(heart_rate_series.between(start, end), weight, age, gender)
+
+
 def process_fit_file(file_path: str, weight: float, age: float, gender: str) -> ProcessingResult:
     """
     Process a single FIT file to compute the total calories burned.
@@ -218,7 +754,7 @@ def process_fit_file(file_path: str, weight: float, age: float, gender: str) ->
         MissingDataError: If required data is missing from the file
         ValueError: If input parameters are invalid
     """
-    import os
+    import stat
     import time
     from src.validators.input_validator import validate_file_path
     
@@ -235,11 +771,14 @@ def process_fit_file(file_path: str, weight: float, age: float, gender: str) ->
             gender=gender
         )
         
-        if not os.path.exists(validated_file_path):
+        # A single stat call covers both the existence and regular-file checks
+        try:
+            file_stat = os.stat(validated_file_path)
+        except FileNotFoundError as e:
             logger.error(f"File not found: {validated_file_path}")
-            raise FileNotFoundError(f"File not found: {validated_file_path}")
+            raise FileNotFoundError(f"File not found: {validated_file_path}") from e
             
-        if not os.path.isfile(validated_file_path):
+        if not stat.S_ISREG(file_stat.st_mode):
             logger.error(f"Not a file: {validated_file_path}")
             raise ValueError(f"Not a file: {validated_file_path}")
             
@@ -247,32 +786,54 @@ def process_fit_file(file_path: str, weight: float, age: float, gender: str) ->
             logger.error(f"Permission denied: {validated_file_path}")
             raise PermissionError(f"Permission denied: {validated_file_path}")
         
+        # Successful results are cached on disk per file version and inputs
+        cache_key = None
+        if _cache.cache_enabled():
+            cache_key = _cache.file_cache_key(
+                'processing', validated_file_path, file_stat,
+                validated_inputs['weight'], validated_inputs['age'], validated_inputs['gender']
+            )
+            cached_result = _cache.load(cache_key)
+            if cached_result is not None:
+                logger.debug("Using cached result for %s", validated_file_path)
+                # Report how long this call took, not the run that cached it
+                return replace(cached_result, processing_time_seconds=time.time() - start_time)
+        
         try:
-            fitfile = FitFile(validated_file_path)
+            fitfile = open_fit_file(validated_file_path)
         except Exception as e:
             logger.error(f"Error opening FIT file {validated_file_path}: {e}")
             raise InvalidFitFileError(f"Error opening FIT file: {e}") from e
         
         try:
-            heart_rate_data_tuples = extract_heart_rate_data(fitfile)
-            heart_rate_data_objects = create_heart_rate_data_from_tuples(heart_rate_data_tuples)
+            heart_rate_series = extract_heart_rate_series(fitfile)
+            
+            # FitFile keeps every parsed message alive; release it before
+            # integration so long activities don't hold all records in memory
+            fitfile.close()
+            fitfile = None
+            
             calorie_data = integrate_calories_over_intervals(
-                heart_rate_data_tuples,
+                heart_rate_series,
                 validated_inputs['weight'],
                 validated_inputs['age'],
-                validated_inputs['gender']
+                validated_inputs['gender'],
+                _validated=True
             )
             
             processing_time = time.time() - start_time
             
-            return ProcessingResult(
+            result = ProcessingResult(
                 file_path=validated_file_path,
                 success=True,
                 calorie_data=calorie_data,
-                heart_rate_data=heart_rate_data_objects,
                 processing_time_seconds=processing_time,
-                metadata={'file_size_bytes': os.path.getsize(validated_file_path)}
+                metadata={'file_size_bytes': file_stat.st_size},
+                heart_rate_series=heart_rate_series
             )
+            if cache_key is not None:
+                _cache.store(cache_key, result)
+            return result
             
         except MissingDataError as e:
             logger.error(f"No heart rate data found in {validated_file_path}")
@@ -309,4 +870,54 @@ def process_fit_file(file_path: str, weight: float, age: float, gender: str) ->
             success=False,
             error_message=f"Unexpected error: {e}",
             processing_time_seconds=processing_time
-        )
\ No newline at end of file
+        )
+
+
+def process_fit_files(file_paths: Iterable[str], weight: float, age: float, gender: str,
+                      max_workers: Optional[int] = None) -> Dict[str, ProcessingResult]:
+    """
+    Process several FIT files in parallel worker processes.
+    
+    Decoding a FIT file is CPU-bound pure Python, so files are spread across
+    processes rather than threads. A single file (or max_workers=1) is
+    processed in the current process.
+    
+    Args:
+        file_paths: Paths of the FIT files to process
+        weight: User's weight in kg
+        age: User's age in years
+        gender: User's gender ('male' or 'female')
+        max_workers: Maximum number of worker processes (defaults to the CPU count)
+        
+    Returns:
+        Dictionary mapping each file path to its ProcessingResult, in input order
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    file_paths = list(file_paths)
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+    max_workers = min(max_workers, len(file_paths))
+    
+    if max_workers <= 1:
+        return {file_path: process_fit_file(file_path, weight, age, gender) for file_path in file_paths}
+    
+    results = {}
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = [
+            executor.submit(process_fit_file, file_path, weight, age, gender)
+            for file_path in file_paths
+        ]
+        for file_path, future in zip(file_paths, futures):
+            try:
+                results[file_path] = future.result()
+            except Exception as e:
+                # process_fit_file reports its own errors; this covers worker failures
+                logger.error(f"Worker failed processing {file_path}: {e}")
+                results[file_path] = ProcessingResult(
+                    file_path=file_path,
+                    success=False,
+                    error_message=f"Unexpected error: {e}"
+                )
+    
+    return results
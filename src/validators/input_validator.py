@@ -7,13 +7,25 @@ heart rate data, and FIT file data integrity checks.
 
 import logging
 from datetime import datetime
+from itertools import compress, groupby, islice, repeat
+from operator import eq, gt, itemgetter, le, sub, truediv
 from typing import List, Tuple, Dict, Any, Optional, Union
 from src.core.logger import get_logger
 from src.exceptions import InputValidationError
+from src.models._common import _NUMBER_TYPES, _VALID_GENDERS
+from src.models.fit_data import HeartRateSeries, from_epoch_seconds, to_epoch_seconds
 
 # Get logger for this module
 logger = get_logger(__name__)
 
+# Characters rejected in file paths, in the order they are reported
+_DANGEROUS_PATH_CHARS_ORDER = ('<', '>', '|', '*', '?')
+_DANGEROUS_PATH_CHARS = frozenset(_DANGEROUS_PATH_CHARS_ORDER)
+
+# Accessors for the columns of (timestamp, heart_rate) tuples
+_get_timestamp = itemgetter(0)
+_get_heart_rate = itemgetter(1)
+
 
 def validate_gender(gender: str) -> str:
     """
@@ -28,11 +40,15 @@ def validate_gender(gender: str) -> str:
     Raises:
         InputValidationError: If the gender is not 'male' or 'female'
     """
+    # Already-normalized input (the usual case) needs no new strings
+    if type(gender) is str and gender in _VALID_GENDERS:
+        return gender
+        
     if not isinstance(gender, str):
         raise InputValidationError(f"Gender must be a string, got {type(gender).__name__}")
         
     normalized = gender.strip().lower()
-    if normalized not in ['male', 'female']:
+    if normalized not in _VALID_GENDERS:
         raise InputValidationError(f"Gender must be 'male' or 'female', got '{gender}'")
     return normalized
 
@@ -183,6 +199,34 @@ def validate_calculation_inputs(heart_rate: Optional[float] = None,
     return validated
 
 
+def _validate_heart_rate_batch(heart_rate_data: list) -> Optional[List[Tuple[datetime, float]]]:
+    """
+    Validate a whole list of heart rate tuples column by column.
+    
+    Performs the same checks as the item-by-item loop in
+    validate_heart_rate_data using map(), min() and max() over the columns.
+    
+    Args:
+        heart_rate_data: Non-empty list of (timestamp, heart_rate) tuples
+        
+    Returns:
+        List of (timestamp, heart_rate) tuples with heart_rate as float, or
+        None if any item is invalid (so the caller can report which one)
+    """
+    if not (all(map(isinstance, heart_rate_data, repeat(tuple)))
+            and set(map(len, heart_rate_data)) == {2}):
+        return None
+        
+    timestamps = list(map(_get_timestamp, heart_rate_data))
+    heart_rates = list(map(_get_heart_rate, heart_rate_data))
+    if not (all(map(isinstance, timestamps, repeat(datetime)))
+            and all(map(isinstance, heart_rates, repeat(_NUMBER_TYPES)))
+            and min(heart_rates) > 0 and max(heart_rates) <= 250):
+        return None
+        
+    return list(zip(timestamps, map(float, heart_rates)))
+
+
 def validate_heart_rate_data(heart_rate_data: List[Tuple[datetime, Union[int, float]]]) -> List[Tuple[datetime, float]]:
     """
     Validate a list of heart rate data tuples.
@@ -193,6 +237,23 @@ def validate_heart_rate_data(heart_rate_data: List[Tuple[datetime, Union[int, fl
     Returns:
         List of validated (timestamp, heart_rate) tuples with heart_rate as float
         
+    Raises:
+        InputValidationError: If data is invalid or contains unreasonable values
+    """
+    return _validate_heart_rate_data(heart_rate_data)[0]
+
+
+def _validate_heart_rate_data(heart_rate_data: List[Tuple[datetime, Union[int, float]]]) -> Tuple[List[Tuple[datetime, float]], bool]:
+    """
+    Validate a list of heart rate data tuples and report whether it is in order.
+    
+    Args:
+        heart_rate_data: List of (timestamp, heart_rate) tuples
+        
+    Returns:
+        Tuple of (validated data as in validate_heart_rate_data, whether the
+        timestamps are in chronological order)
+        
     Raises:
         InputValidationError: If data is invalid or contains unreasonable values
     """
@@ -202,47 +263,54 @@ def validate_heart_rate_data(heart_rate_data: List[Tuple[datetime, Union[int, fl
     if not heart_rate_data:
         raise InputValidationError("Heart rate data cannot be empty")
         
-    validated_data = []
-    
-    for i, item in enumerate(heart_rate_data):
-        if not isinstance(item, tuple) or len(item) != 2:
-            raise InputValidationError(f"Item {i} must be a tuple of length 2, got {item}")
-            
-        timestamp, heart_rate = item
+    validated_data = _validate_heart_rate_batch(heart_rate_data)
+    if validated_data is None:
+        # Re-check item by item to report which entry is invalid
+        validated_data = [None] * len(heart_rate_data)
         
-        # Validate timestamp
-        if not isinstance(timestamp, datetime):
-            raise InputValidationError(f"Timestamp at index {i} must be a datetime object, got {type(timestamp).__name__}")
+        for i, item in enumerate(heart_rate_data):
+            if not isinstance(item, tuple) or len(item) != 2:
+                raise InputValidationError(f"Item {i} must be a tuple of length 2, got {item}")
+                
+            timestamp, heart_rate = item
             
-        # Validate heart rate
-        try:
-            validated_hr = validate_heart_rate(heart_rate)
-        except InputValidationError as e:
-            raise InputValidationError(f"Heart rate at index {i}: {e}")
-            
-        validated_data.append((timestamp, validated_hr))
-    
-    # Check for chronological order
-    timestamps = [item[0] for item in validated_data]
-    if timestamps != sorted(timestamps):
+            # Validate timestamp
+            if not isinstance(timestamp, datetime):
+                raise InputValidationError(f"Timestamp at index {i} must be a datetime object, got {type(timestamp).__name__}")
+                
+            # Validate heart rate
+            try:
+                validated_hr = validate_heart_rate(heart_rate)
+            except InputValidationError as e:
+                raise InputValidationError(f"Heart rate at index {i}: {e}")
+                
+            validated_data[i] = (timestamp, validated_hr)
+    
+    # Check for chronological order by comparing neighbours instead of
+    # building a sorted copy; in ordered data any duplicates are neighbours too
+    timestamps = list(map(_get_timestamp, validated_data))
+    is_sorted = all(map(le, timestamps, islice(timestamps, 1, None)))
+    if is_sorted:
+        has_duplicates = any(map(eq, timestamps, islice(timestamps, 1, None)))
+    else:
         logger.warning("Heart rate data is not in chronological order")
+        has_duplicates = len(set(timestamps)) != len(timestamps)
     
     # Check for duplicate timestamps
-    unique_timestamps = set(timestamps)
-    if len(unique_timestamps) != len(timestamps):
+    if has_duplicates:
         logger.warning("Heart rate data contains duplicate timestamps")
     
-    return validated_data
+    return validated_data, is_sorted
 
 
-def validate_fit_file_data_integrity(heart_rate_data: List[Tuple[datetime, Union[int, float]]],
+def validate_fit_file_data_integrity(heart_rate_data: Union[List[Tuple[datetime, Union[int, float]]], HeartRateSeries],
                                     min_data_points: int = 2,
                                     max_gap_minutes: float = 60.0) -> Dict[str, Any]:
     """
     Validate FIT file data integrity and provide quality metrics.
     
     Args:
-        heart_rate_data: List of (timestamp, heart_rate) tuples
+        heart_rate_data: List of (timestamp, heart_rate) tuples, or a HeartRateSeries
         min_data_points: Minimum number of data points required
         max_gap_minutes: Maximum allowed gap between data points in minutes
         
@@ -252,38 +320,60 @@ def validate_fit_file_data_integrity(heart_rate_data: List[Tuple[datetime, Union
     Raises:
         InputValidationError: If data fails basic integrity checks
     """
-    if not isinstance(heart_rate_data, list):
+    if not isinstance(heart_rate_data, (list, HeartRateSeries)):
         raise InputValidationError(f"Heart rate data must be a list, got {type(heart_rate_data).__name__}")
         
     if len(heart_rate_data) < min_data_points:
         raise InputValidationError(f"At least {min_data_points} heart rate data points are required, got {len(heart_rate_data)}")
     
-    # Validate individual data points
-    validated_data = validate_heart_rate_data(heart_rate_data)
-    
-    # Sort by timestamp for analysis
-    sorted_data = sorted(validated_data, key=lambda x: x[0])
+    if isinstance(heart_rate_data, HeartRateSeries):
+        # Columns are used as they are; datetimes are only rebuilt for the
+        # samples named in the report
+        try:
+            heart_rate_data.validate()
+        except (TypeError, ValueError) as e:
+            raise InputValidationError(f"Invalid heart rate series: {e}") from e
+        series = heart_rate_data.sorted_by_time()
+        seconds = series.timestamps
+        heart_rates = series.heart_rates
+        
+        def timestamp_at(i: int) -> datetime:
+            return from_epoch_seconds(seconds[i])
+    else:
+        # Validate individual data points
+        validated_data, is_sorted = _validate_heart_rate_data(heart_rate_data)
+        
+        # Sort by timestamp for analysis; FIT data is normally already in
+        # order, which validation has just checked
+        sorted_data = validated_data if is_sorted else sorted(validated_data, key=_get_timestamp)
+        
+        # Convert timestamps to epoch seconds once so gaps are plain float
+        # subtraction rather than a timedelta per interval
+        timestamps = list(map(_get_timestamp, sorted_data))
+        seconds = list(map(to_epoch_seconds, timestamps))
+        heart_rates = list(map(_get_heart_rate, sorted_data))
+        timestamp_at = timestamps.__getitem__
     
     # Calculate quality metrics
-    total_duration = (sorted_data[-1][0] - sorted_data[0][0]).total_seconds() / 60.0  # minutes
-    data_points = len(sorted_data)
+    total_duration = (seconds[-1] - seconds[0]) / 60.0  # minutes
+    data_points = len(heart_rates)
     avg_interval = total_duration / (data_points - 1) if data_points > 1 else 0
     
-    # Check for large gaps
-    large_gaps = []
-    for i in range(1, len(sorted_data)):
-        gap_minutes = (sorted_data[i][0] - sorted_data[i-1][0]).total_seconds() / 60.0
-        if gap_minutes > max_gap_minutes:
-            large_gaps.append({
-                'start_time': sorted_data[i-1][0],
-                'end_time': sorted_data[i][0],
-                'gap_minutes': gap_minutes
-            })
+    # Check for large gaps; gap lengths are computed as one column and only
+    # the (rare) large ones are visited in Python
+    gap_minutes = list(map(truediv, map(sub, islice(seconds, 1, None), seconds), repeat(60.0)))
+    large_gaps = [
+        {
+            'start_time': timestamp_at(i),
+            'end_time': timestamp_at(i + 1),
+            'gap_minutes': gap_minutes[i]
+        }
+        for i in compress(range(len(gap_minutes)), map(gt, gap_minutes, repeat(max_gap_minutes)))
+    ]
     
     # Calculate heart rate statistics
-    heart_rates = [hr for _, hr in sorted_data]
-    min_hr = min(heart_rates)
-    max_hr = max(heart_rates)
+    min_hr = float(min(heart_rates))
+    max_hr = float(max(heart_rates))
     avg_hr = sum(heart_rates) / len(heart_rates)
     
     # Check for unrealistic heart rate patterns
@@ -301,28 +391,23 @@ def validate_fit_file_data_integrity(heart_rate_data: List[Tuple[datetime, Union
     if large_gaps:
         warnings.append(f"Found {len(large_gaps)} large gaps (>{max_gap_minutes} min) in data")
     
-    # Check for flat-line periods (same HR for extended time)
+    # Check for flat-line periods (same HR for extended time), one groupby
+    # run of equal values at a time.
+    # A period spans from the run's second reading to the first reading after
+    # it; a run still in progress at the end of the data is not reported.
     flat_periods = []
-    current_hr = None
-    flat_start = None
-    flat_count = 0
-    
-    for timestamp, hr in sorted_data:
-        if hr == current_hr:
-            if flat_start is None:
-                flat_start = timestamp
-            flat_count += 1
-        else:
-            if flat_count >= 10:  # 10 or more consecutive identical readings
-                flat_periods.append({
-                    'heart_rate': current_hr,
-                    'start_time': flat_start,
-                    'end_time': timestamp,
-                    'count': flat_count
-                })
-            current_hr = hr
-            flat_start = None
-            flat_count = 1
+    run_start = 0
+    for hr, run in groupby(heart_rates):
+        run_length = len(list(run))
+        run_end = run_start + run_length
+        if run_length >= 10 and run_end < data_points:  # 10 or more consecutive identical readings
+            flat_periods.append({
+                'heart_rate': float(hr),
+                'start_time': timestamp_at(run_start + 1),
+                'end_time': timestamp_at(run_end),
+                'count': run_length
+            })
+        run_start = run_end
     
     if flat_periods:
         warnings.append(f"Found {len(flat_periods)} potential flat-line periods")
@@ -402,11 +487,12 @@ def validate_file_path(file_path: str) -> str:
     if not file_path.strip():
         raise InputValidationError("File path cannot be empty")
         
-    # Check for potentially dangerous characters (basic check)
-    dangerous_chars = ['<', '>', '|', '*', '?']
-    for char in dangerous_chars:
-        if char in file_path:
-            raise InputValidationError(f"File path contains invalid character: '{char}'")
+    # Check for potentially dangerous characters (basic check) with a single
+    # scan of the path; the loop only runs to name the offending character
+    if not _DANGEROUS_PATH_CHARS.isdisjoint(file_path):
+        for char in _DANGEROUS_PATH_CHARS_ORDER:
+            if char in file_path:
+                raise InputValidationError(f"File path contains invalid character: '{char}'")
     
     return file_path.strip()
 
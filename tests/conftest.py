@@ -0,0 +1,7 @@
+import pytest
+
+
+@pytest.fixture(autouse=True)
+def disable_disk_cache(monkeypatch):
+    """Keep tests from reading or writing the user's on-disk result cache."""
+    monkeypatch.setenv('FIT2CAL_CACHE', '0')
@@ -1,10 +1,14 @@
 import pytest
 from unittest.mock import MagicMock, patch, mock_open
+from array import array
+from dataclasses import replace
 from datetime import datetime, timedelta
+from types import SimpleNamespace
 import logging
+import stat
 
 # Patch logger before importing the modules
-@pytest.fixture(autouse=True)
+@pytest.fixture(autouse=True, scope='module')
 def mock_logger():
     with patch('src.core.logger.get_logger') as mock_get_logger:
         mock_logger = MagicMock()
@@ -12,20 +16,53 @@ def mock_logger():
         yield mock_logger
 
 # Import from utils module
-from src.core.utils import calories_burned, load_config
+from src.core.utils import calories_burned, keytel_coefficients, load_config
 
 from src.services.fit_processor import (
     extract_heart_rate_data,
+    extract_heart_rate_series,
+    integrate_calories_adaptive,
     integrate_calories_over_intervals,
-    process_fit_file
+    integrate_calories_range,
+    make_integrator,
+    process_fit_file,
+    process_fit_files
 )
+from src.models.fit_data import (
+    HeartRateSeries,
+    calculate_average_heart_rate,
+    calculate_total_duration,
+    create_heart_rate_data_from_tuples,
+    summarize_heart_rate_data
+)
+from src.models.metadata import DeviceInfo, FitFileMetadata, merge_metadata
+from src.services.file_manager import extract_fit_file_metadata, rename_fit_file
+from src.validators.input_validator import validate_heart_rate_data, validate_fit_file_data_integrity
 from src.exceptions import (
     MissingDataError,
     InvalidFitFileError,
     FitFileError,
-    ConfigError
+    ConfigError,
+    InputValidationError
 )
 
+# Minimal os.stat results for mocking file system checks
+REGULAR_FILE_STAT = SimpleNamespace(st_mode=stat.S_IFREG | 0o644, st_size=1024)
+DIRECTORY_STAT = SimpleNamespace(st_mode=stat.S_IFDIR | 0o755, st_size=4096)
+
+def fake_fitfile(*samples):
+    """Build a lightweight FitFile stand-in whose records hold the given (timestamp, heart_rate) pairs."""
+    records = [
+        [SimpleNamespace(name='timestamp', value=timestamp), SimpleNamespace(name='heart_rate', value=hr)]
+        for timestamp, hr in samples
+    ]
+    return SimpleNamespace(get_messages=lambda *args, **kwargs: records, close=lambda: None)
+
+@pytest.fixture(scope='module')
+def two_record_fitfile():
+    t0 = datetime(2024,1,1,12,0,0)
+    return fake_fitfile((t0, 100), (t0 + timedelta(minutes=1), 110))
+
 def test_calories_burned_male_typical():
     kcal = calories_burned(150, 30, 70, 30, gender='male')
     assert kcal > 0
@@ -34,27 +71,47 @@ def test_calories_burned_female_typical():
     kcal = calories_burned(150, 30, 70, 30, gender='female')
     assert kcal > 0
 
+def test_keytel_coefficients_by_gender():
+    base, hr_coef, weight_coef, age_coef, conversion = keytel_coefficients('Female')
+    assert keytel_coefficients('female') == (base, hr_coef, weight_coef, age_coef, conversion)
+    assert calories_burned(150, 1, 70, 30, gender='female') == pytest.approx(
+        (base + hr_coef * 150 + weight_coef * 70 + age_coef * 30) / conversion)
+
 def test_calories_burned_zero_duration():
     assert calories_burned(150, 0, 70, 30) == 0
 
 def test_calories_burned_negative_values():
     assert isinstance(calories_burned(-10, -5, -70, -30), float)
 
-def test_extract_heart_rate_data():
-    from types import SimpleNamespace
-    mock_fitfile = MagicMock()
-    record1 = [SimpleNamespace(name='timestamp', value=datetime(2024,1,1,12,0,0)), SimpleNamespace(name='heart_rate', value=100)]
-    record2 = [SimpleNamespace(name='timestamp', value=datetime(2024,1,1,12,1,0)), SimpleNamespace(name='heart_rate', value=110)]
-    mock_fitfile.get_messages.return_value = [
-        SimpleNamespace(__iter__=lambda self: iter(record1)),
-        SimpleNamespace(__iter__=lambda self: iter(record2)),
+def test_extract_heart_rate_data(two_record_fitfile):
+    data = extract_heart_rate_data(two_record_fitfile)
+    assert data == [
+        (datetime(2024,1,1,12,0,0), 100),
+        (datetime(2024,1,1,12,1,0), 110),
     ]
-    data = extract_heart_rate_data(mock_fitfile)
+
+def test_extract_heart_rate_data_unsorted_records():
+    data = extract_heart_rate_data(fake_fitfile((datetime(2024,1,1,12,1,0), 110), (datetime(2024,1,1,12,0,0), 100)))
     assert data == [
         (datetime(2024,1,1,12,0,0), 100),
         (datetime(2024,1,1,12,1,0), 110),
     ]
 
+def test_extract_heart_rate_data_skips_out_of_range():
+    fitfile = fake_fitfile((datetime(2024,1,1,12,0,0), 100), (datetime(2024,1,1,12,1,0), 255))
+    assert extract_heart_rate_data(fitfile) == [(datetime(2024,1,1,12,0,0), 100)]
+
+def test_extract_heart_rate_series_unsorted_records():
+    series = extract_heart_rate_series(fake_fitfile((datetime(2024,1,1,12,1,0), 110), (datetime(2024,1,1,12,0,0), 100)))
+    assert list(series.heart_rates) == [100, 110]
+    assert series.timestamps[1] - series.timestamps[0] == 60.0
+    assert series.heart_rates.typecode == 'B'
+
+def test_extract_heart_rate_series_fractional_heart_rate():
+    series = extract_heart_rate_series(fake_fitfile((datetime(2024,1,1,12,0,0), 100.5)))
+    assert series.heart_rates.typecode == 'd'
+    assert list(series.heart_rates) == [100.5]
+
 def test_integrate_calories_over_intervals():
     t0 = datetime(2024,1,1,12,0,0)
     t1 = t0 + timedelta(minutes=1)
@@ -65,39 +122,276 @@ def test_integrate_calories_over_intervals():
     assert result.duration_minutes > 0
     assert result.average_heart_rate > 0
 
-@patch('src.services.fit_processor.FitFile')
-@patch('os.path.getsize')
-@patch('os.path.exists')
-@patch('os.path.isfile')
+def test_make_integrator_is_cached_per_profile():
+    assert make_integrator(70.0, 30.0, 'male') is make_integrator(70.0, 30.0, 'male')
+    assert make_integrator(70.0, 30.0, 'female') is not make_integrator(70.0, 30.0, 'male')
+    total, intervals = make_integrator(70.0, 30.0, 'male')([0.0, 60.0], [100, 100])
+    assert total == pytest.approx(calories_burned(100, 1.0, 70.0, 30.0, 'male'))
+    assert intervals == 1
+
+def test_integrate_calories_decimate():
+    t0 = datetime(2024,1,1,12,0,0)
+    # Trapezoids are exact for a linear ramp, so decimating loses nothing
+    hr_data = [(t0 + timedelta(seconds=i), 100 + i) for i in range(11)]
+    full = integrate_calories_over_intervals(hr_data, 70, 30, 'male')
+    decimated = integrate_calories_over_intervals(hr_data, 70, 30, 'male', decimate=4)
+    assert decimated.total_calories == pytest.approx(full.total_calories)
+    assert decimated.intervals_processed == 3
+    assert decimated.duration_minutes == full.duration_minutes
+    with pytest.raises(ValueError, match="decimate"):
+        integrate_calories_over_intervals(hr_data, 70, 30, 'male', decimate=0)
+
+def test_integrate_calories_adaptive_stops_early_on_steady_data():
+    t0 = datetime(2024,1,1,12,0,0)
+    hr_data = [(t0 + timedelta(seconds=i), 100 + i // 600) for i in range(3600)]
+    full = integrate_calories_over_intervals(hr_data, 70, 30, 'male')
+    adaptive = integrate_calories_adaptive(hr_data, 70, 30, 'male')
+    assert adaptive.total_calories == pytest.approx(full.total_calories, rel=1e-3)
+    assert adaptive.intervals_processed < full.intervals_processed
+    assert adaptive.average_heart_rate == full.average_heart_rate
+    assert adaptive.duration_minutes == full.duration_minutes
+    with pytest.raises(ValueError, match="eps"):
+        integrate_calories_adaptive(hr_data, 70, 30, 'male', eps=0)
+
+@pytest.mark.parametrize('heart_rates', [
+    [100] + [200] * 28 + [100],                           # shorter than the starting segment
+    [120] * 3585 + [100] + [200] * 28 + [100],            # spike in a non-aligned tail
+    [120] * 1000 + [160] * 40 + [120] * 1001,             # spike spanning coarse samples
+])
+def test_integrate_calories_adaptive_matches_full_integration(heart_rates):
+    t0 = datetime(2024,1,1,12,0,0)
+    hr_data = [(t0 + timedelta(seconds=i), hr) for i, hr in enumerate(heart_rates)]
+    full = integrate_calories_over_intervals(hr_data, 70, 30, 'male')
+    adaptive = integrate_calories_adaptive(hr_data, 70, 30, 'male', eps=1e-3)
+    assert adaptive.total_calories == pytest.approx(full.total_calories, rel=1e-3)
+
+def test_integrate_calories_adaptive_noisy_data_uses_every_interval():
+    t0 = datetime(2024,1,1,12,0,0)
+    hr_data = [(t0 + timedelta(seconds=i), 100 + (i * 37) % 60) for i in range(3600)]
+    full = integrate_calories_over_intervals(hr_data, 70, 30, 'male')
+    adaptive = integrate_calories_adaptive(hr_data, 70, 30, 'male')
+    assert adaptive.total_calories == pytest.approx(full.total_calories, rel=1e-12)
+    assert adaptive.intervals_processed == full.intervals_processed
+
+def test_integrate_calories_range_matches_slice():
+    t0 = datetime(2024,1,1,12,0,0)
+    hr_data = [(t0 + timedelta(minutes=i), 100 + i) for i in range(10)]
+    series = HeartRateSeries.from_tuples(hr_data)
+    result = integrate_calories_range(series, t0 + timedelta(minutes=3), t0 + timedelta(minutes=6, seconds=30), 70, 30, 'male')
+    expected = integrate_calories_over_intervals(hr_data[3:7], 70, 30, 'male')
+    assert result.total_calories == pytest.approx(expected.total_calories)
+    assert result.intervals_processed == 3
+    with pytest.raises(ValueError):
+        integrate_calories_range(series, t0 + timedelta(minutes=20), t0 + timedelta(minutes=30), 70, 30, 'male')
+
+def test_integrate_calories_accepts_series():
+    t0 = datetime(2024,1,1,12,0,0)
+    hr_data = [(t0 + timedelta(seconds=i), 100 + i) for i in range(10)]
+    series = HeartRateSeries.from_tuples(hr_data)
+    assert series.to_tuples() == hr_data
+    assert integrate_calories_over_intervals(series, 70, 30, 'male') == integrate_calories_over_intervals(hr_data, 70, 30, 'male')
+
+def test_integrate_calories_matches_per_interval_sum():
+    t0 = datetime(2024,1,1,12,0,0)
+    regular = [(t0 + timedelta(seconds=5*i), 90 + i % 40) for i in range(200)]
+    # A repeated timestamp exercises the skipped-interval path
+    irregular = regular[:100] + [(regular[99][0], 150)] + [(t + timedelta(seconds=5), hr) for t, hr in regular[100:]]
+    for hr_data in (regular, irregular):
+        expected = sum(
+            calories_burned((hr_data[i-1][1] + hr_data[i][1]) / 2, (hr_data[i][0] - hr_data[i-1][0]).total_seconds() / 60, 70, 30, 'female')
+            for i in range(1, len(hr_data)) if hr_data[i][0] > hr_data[i-1][0]
+        )
+        result = integrate_calories_over_intervals(hr_data, 70, 30, 'female')
+        assert result.total_calories == pytest.approx(expected)
+
+@patch('fitparse.FitFile')
+def test_process_fit_file_uses_disk_cache(mock_fitfile_cls, tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.delenv('FIT2CAL_CACHE')
+    fit_path = tmp_path / 'ride.fit'
+    fit_path.write_bytes(b'fit')
+    t0 = datetime(2024,1,1,12,0,0)
+    mock_fitfile_cls.return_value.get_messages.return_value = [
+        [SimpleNamespace(name='timestamp', value=t0), SimpleNamespace(name='heart_rate', value=100)],
+        [SimpleNamespace(name='timestamp', value=t0 + timedelta(minutes=1)), SimpleNamespace(name='heart_rate', value=110)],
+    ]
+    first = process_fit_file(str(fit_path), 70, 30, 'male')
+    second = process_fit_file(str(fit_path), 70, 30, 'male')
+    other_inputs = process_fit_file(str(fit_path), 80, 30, 'male')
+    assert first.success and second.success and other_inputs.success
+    assert mock_fitfile_cls.call_count == 2
+    assert second.calorie_data == first.calorie_data
+    assert other_inputs.calorie_data.total_calories != first.calorie_data.total_calories
+    stale = replace(first, processing_time_seconds=1000.0)
+    with patch('src.services._cache.load', return_value=stale):
+        cached = process_fit_file(str(fit_path), 70, 30, 'male')
+    assert cached.calorie_data == first.calorie_data
+    assert cached.processing_time_seconds < 1000.0
+
+@patch('fitparse.FitFile')
+@patch('os.stat')
 @patch('os.access')
-def test_process_fit_file(mock_access, mock_isfile, mock_exists, mock_getsize, mock_fitfile_cls):
+def test_process_fit_file(mock_access, mock_stat, mock_fitfile_cls, two_record_fitfile):
     # Setup file existence mocks
-    mock_exists.return_value = True
-    mock_isfile.return_value = True
+    mock_stat.return_value = REGULAR_FILE_STAT
     mock_access.return_value = True
-    mock_getsize.return_value = 1024
-    
-    mock_fitfile = MagicMock()
-    t0 = datetime(2024,1,1,12,0,0)
-    t1 = t0 + timedelta(minutes=1)
-    from types import SimpleNamespace
-    mock_fitfile.get_messages.return_value = [
-        SimpleNamespace(__iter__=lambda self: iter([
-            SimpleNamespace(name='timestamp', value=t0),
-            SimpleNamespace(name='heart_rate', value=100)
-        ])),
-        SimpleNamespace(__iter__=lambda self: iter([
-            SimpleNamespace(name='timestamp', value=t1),
-            SimpleNamespace(name='heart_rate', value=110)
-        ])),
-    ]
-    mock_fitfile_cls.return_value = mock_fitfile
+    mock_fitfile_cls.return_value = two_record_fitfile
     
     result = process_fit_file('fake.fit', 70, 30, 'male')
     assert result.success is True
     assert result.calorie_data.total_calories > 0
     assert result.calorie_data.duration_minutes > 0
     assert result.calorie_data.average_heart_rate > 0
+    assert result.metadata == {'file_size_bytes': 1024}
+    assert result.heart_rate_data is None
+    assert [d.heart_rate for d in result.get_heart_rate_data()] == [100, 110]
+
+def test_heart_rate_series_summary():
+    t0 = datetime(2024,1,1,12,0,0)
+    series = HeartRateSeries.from_tuples([(t0, 100), (t0 + timedelta(minutes=2), 120)])
+    assert len(series) == 2
+    assert calculate_average_heart_rate(series) == 110
+    assert calculate_total_duration(series) == pytest.approx(2.0)
+
+def test_heart_rate_series_from_tuples_columns():
+    t0 = datetime(2024,1,1,12,0,0)
+    series = HeartRateSeries.from_tuples([(t0, 100), (t0 + timedelta(seconds=1), 101.5)])
+    assert series.heart_rates.typecode == 'd'
+    assert list(series.timestamps) == [1704110400.0, 1704110401.0]
+    with pytest.raises(TypeError, match="Heart rate at index 1"):
+        HeartRateSeries.from_tuples([(t0, 100), (t0, '101')])
+
+def test_heart_rate_series_rejects_values_after_nan():
+    with pytest.raises(ValueError, match="NaN"):
+        HeartRateSeries(timestamps=array('d', [0.0, 1.0]), heart_rates=array('d', [float('nan'), 300.0]))
+
+def test_summarize_heart_rate_data_list():
+    t0 = datetime(2024,1,1,12,0,0)
+    data = create_heart_rate_data_from_tuples([(t0 + timedelta(minutes=3), 130), (t0, 100), (t0 + timedelta(minutes=1), 115)])
+    average, duration = summarize_heart_rate_data(data)
+    assert average == pytest.approx(115)
+    assert duration == pytest.approx(3.0)
+
+def test_create_heart_rate_data_from_tuples_rejects_nan():
+    t0 = datetime(2024,1,1,12,0,0)
+    with pytest.raises(ValueError, match="index 0"):
+        create_heart_rate_data_from_tuples([(t0, float('nan')), (t0 + timedelta(seconds=1), 300)])
+
+def test_validate_heart_rate_data_batch():
+    t0 = datetime(2024,1,1,12,0,0)
+    validated = validate_heart_rate_data([(t0, 100), (t0 + timedelta(seconds=1), 101.5)])
+    assert validated == [(t0, 100.0), (t0 + timedelta(seconds=1), 101.5)]
+    assert type(validated[0][1]) is float
+    with pytest.raises(InputValidationError, match="Heart rate at index 1"):
+        validate_heart_rate_data([(t0, 100), (t0 + timedelta(seconds=1), 300)])
+
+def test_validate_fit_file_data_integrity_gaps_and_flat_periods():
+    t0 = datetime(2024,1,1,12,0,0)
+    data = [(t0 + timedelta(seconds=i), 120) for i in range(12)]
+    data.append((t0 + timedelta(minutes=90), 130))
+    report = validate_fit_file_data_integrity(data)
+    assert report['heart_rate_stats'] == {'min': 120.0, 'max': 130.0, 'average': pytest.approx(1570 / 13), 'range': 10.0}
+    assert [gap['end_time'] for gap in report['large_gaps']] == [t0 + timedelta(minutes=90)]
+    assert report['flat_periods'] == [{
+        'heart_rate': 120.0,
+        'start_time': t0 + timedelta(seconds=1),
+        'end_time': t0 + timedelta(minutes=90),
+        'count': 12
+    }]
+    assert validate_fit_file_data_integrity(HeartRateSeries.from_tuples(data[::-1])) == report
+
+def test_merge_metadata_replaces_known_fields():
+    base = FitFileMetadata(start_time=datetime(2024,1,1,12,0,0), duration_seconds=600.0, sport='running')
+    merged = merge_metadata(base, {'sport': 'cycling', 'total_calories': 250.0, 'unknown': 1})
+    assert merged.sport == 'cycling'
+    assert merged.total_calories == 250.0
+    assert merged.start_time == base.start_time
+    assert merged.duration_seconds == 600.0
+    assert merged.activity_name == 'cycling'
+    assert base.sport == 'running'
+
+def test_metadata_derived_values_follow_field_changes():
+    metadata = FitFileMetadata(sport='Running', duration_seconds=60.0)
+    assert metadata.activity_name == 'Running'
+    assert metadata.duration_formatted == '1m'
+    metadata.sport = 'Cycling'
+    metadata.duration_seconds = 3600.0
+    assert metadata.activity_name == 'Cycling'
+    assert metadata.duration_formatted == '1h'
+
+def test_metadata_copies_after_to_dict():
+    import copy
+    import pickle
+    from dataclasses import asdict
+    metadata = FitFileMetadata(start_time=datetime(2024,1,1,12,0,0), duration_seconds=60.0,
+                               device_info=DeviceInfo(manufacturer='garmin', product='edge'))
+    view = metadata.to_dict()
+    assert view['device_info']['manufacturer'] == 'garmin'
+    restored = pickle.loads(pickle.dumps(metadata))
+    assert restored == metadata
+    assert restored.to_dict() == view
+    assert copy.deepcopy(metadata) == metadata
+    assert asdict(metadata)['device_info']['product'] == 'edge'
+    metadata.device_info.product = 'fenix'
+    assert metadata.to_dict()['device_info']['product'] == 'fenix'
+    # Returned dictionaries are copies: JSON-serializable and safe to modify
+    import json
+    json.dumps(metadata.to_dict())
+    metadata.to_dict()['device_info']['product'] = 'other'
+    assert metadata.to_dict()['device_info']['product'] == 'fenix'
+
+def test_extract_fit_file_metadata_uses_disk_cache(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.delenv('FIT2CAL_CACHE', raising=False)
+    fit_path = tmp_path / 'ride.fit'
+    fit_path.write_bytes(b'fit')
+    parsed = FitFileMetadata(start_time=datetime(2024,1,1,12,0,0), duration_seconds=60.0, file_path=str(fit_path))
+    with patch('src.services.file_manager._extract_fit_file_metadata', return_value=(parsed, True)) as mock_extract:
+        first = extract_fit_file_metadata(str(fit_path))
+        second = extract_fit_file_metadata(str(fit_path))
+    assert mock_extract.call_count == 1
+    assert first == parsed
+    assert second == parsed
+
+def test_extract_fit_file_metadata_does_not_cache_failures(tmp_path, monkeypatch):
+    monkeypatch.setenv('XDG_CACHE_HOME', str(tmp_path / 'cache'))
+    monkeypatch.delenv('FIT2CAL_CACHE', raising=False)
+    fit_path = tmp_path / 'garbage.fit'
+    fit_path.write_bytes(b'not a fit file')
+    metadata = extract_fit_file_metadata(str(fit_path))
+    assert metadata.start_time is None
+    assert not list((tmp_path / 'cache').rglob('*.pkl'))
+
+def test_extract_fit_file_metadata_closes_only_files_it_opened(monkeypatch):
+    monkeypatch.setenv('FIT2CAL_CACHE', '0')
+    opened = MagicMock()
+    opened.get_messages.side_effect = ValueError('corrupt')
+    with patch('src.services.file_manager.open_fit_file', return_value=opened):
+        extract_fit_file_metadata('ride.fit')
+    opened.close.assert_called_once()
+    passed_in = MagicMock()
+    passed_in.get_messages.return_value = []
+    extract_fit_file_metadata('ride.fit', fitfile=passed_in)
+    passed_in.close.assert_not_called()
+
+def test_rename_fit_file_skips_taken_names(tmp_path):
+    metadata = FitFileMetadata(start_time=datetime(2024,1,1,12,0,0), duration_seconds=60.0, sport='running')
+    (tmp_path / '2024-01-01_1200_running_1m.fit').touch()
+    (tmp_path / '2024-01-01_1200_running_1m_1.fit').touch()
+    original = tmp_path / 'ride.fit'
+    original.touch()
+    new_path = rename_fit_file(str(original), metadata)
+    assert new_path == str(tmp_path / '2024-01-01_1200_running_1m_2.fit')
+    assert not original.exists()
+
+def test_rename_fit_file_uses_existing_names(tmp_path):
+    metadata = FitFileMetadata(start_time=datetime(2024,1,1,12,0,0), duration_seconds=60.0, sport='running')
+    original = tmp_path / 'ride.fit'
+    original.touch()
+    existing_names = {'ride.fit', '2024-01-01_1200_running_1m.fit'}
+    new_path = rename_fit_file(str(original), metadata, existing_names)
+    assert new_path == str(tmp_path / '2024-01-01_1200_running_1m_1.fit')
+    assert existing_names == {'2024-01-01_1200_running_1m.fit', '2024-01-01_1200_running_1m_1.fit'}
 
 def test_load_config_reads_json():
     mock_json = '{"weight_kg": 80, "age_years": 40, "gender": "female"}'
@@ -107,6 +401,30 @@ def test_load_config_reads_json():
         assert config["age_years"] == 40
         assert config["gender"] == "female"
 
+def test_load_config_reloads_when_file_changes(tmp_path):
+    config_path = tmp_path / 'config.json'
+    config_path.write_text('{"weight_kg": 80}')
+    assert load_config(str(config_path)) == {'weight_kg': 80}
+    with patch('builtins.open', side_effect=AssertionError('config should come from the cache')):
+        assert load_config(str(config_path)) == {'weight_kg': 80}
+    config_path.write_text('{"weight_kg": 81.5}')
+    assert load_config(str(config_path)) == {'weight_kg': 81.5}
+
+def test_load_user_config_caches_validated_config(tmp_path, monkeypatch):
+    from src.config import config_manager
+    monkeypatch.setattr(config_manager, 'project_root', str(tmp_path))
+    monkeypatch.setattr(config_manager, '_validated_config', None)
+    (tmp_path / 'config').mkdir()
+    config_path = tmp_path / 'config' / 'config.json'
+    config_path.write_text('{"weight_kg": 80, "age_years": 40, "gender": "Female"}')
+    first = config_manager.load_user_config()
+    assert first == {'weight_kg': 80, 'age_years': 40, 'gender': 'female'}
+    first['weight_kg'] = 1
+    with patch.object(config_manager, 'load_config', side_effect=AssertionError('config should come from the cache')):
+        assert config_manager.load_user_config()['weight_kg'] == 80
+    config_path.write_text('{"weight_kg": 81.5, "age_years": 40, "gender": "female"}')
+    assert config_manager.load_user_config()['weight_kg'] == 81.5
+
 # Tests for error handling scenarios
 
 def test_extract_heart_rate_data_none_fitfile():
@@ -124,11 +442,8 @@ def test_extract_heart_rate_data_invalid_fitfile():
 
 def test_extract_heart_rate_data_no_data():
     """Test that extract_heart_rate_data raises MissingDataError when no heart rate data is found."""
-    mock_fitfile = MagicMock()
-    mock_fitfile.get_messages.return_value = []
-    
     with pytest.raises(MissingDataError, match="No valid heart rate data found"):
-        extract_heart_rate_data(mock_fitfile)
+        extract_heart_rate_data(fake_fitfile())
 
 def test_integrate_calories_empty_data():
     """Test that integrate_calories_over_intervals raises ValueError for empty data."""
@@ -168,47 +483,50 @@ def test_integrate_calories_invalid_gender():
     with pytest.raises(ValueError, match="Gender must be 'male' or 'female'"):
         integrate_calories_over_intervals(hr_data, 70, 30, 'invalid')
 
-@patch('os.path.exists')
-def test_process_fit_file_nonexistent(mock_exists):
+@patch('os.stat')
+def test_process_fit_file_nonexistent(mock_stat):
     """Test that process_fit_file returns error result for nonexistent file."""
-    mock_exists.return_value = False
+    mock_stat.side_effect = FileNotFoundError("nonexistent.fit")
     
     result = process_fit_file('nonexistent.fit', 70, 30, 'male')
     assert result.success is False
     assert "File not found" in result.error_message
 
-@patch('os.path.exists')
-@patch('os.path.isfile')
-def test_process_fit_file_not_a_file(mock_isfile, mock_exists):
+@patch('os.stat')
+def test_process_fit_files_serial_keeps_order(mock_stat):
+    """Test that process_fit_files returns one result per path in input order."""
+    mock_stat.side_effect = FileNotFoundError("missing")
+    
+    results = process_fit_files(['b.fit', 'a.fit'], 70, 30, 'male', max_workers=1)
+    assert list(results) == ['b.fit', 'a.fit']
+    assert all(not result.success for result in results.values())
+
+@patch('os.stat')
+def test_process_fit_file_not_a_file(mock_stat):
     """Test that process_fit_file returns error result if path is not a file."""
-    mock_exists.return_value = True
-    mock_isfile.return_value = False
+    mock_stat.return_value = DIRECTORY_STAT
     
     result = process_fit_file('directory.fit', 70, 30, 'male')
     assert result.success is False
     assert "Not a file" in result.error_message
 
-@patch('os.path.exists')
-@patch('os.path.isfile')
+@patch('os.stat')
 @patch('os.access')
-def test_process_fit_file_permission_denied(mock_access, mock_isfile, mock_exists):
+def test_process_fit_file_permission_denied(mock_access, mock_stat):
     """Test that process_fit_file returns error result for inaccessible file."""
-    mock_exists.return_value = True
-    mock_isfile.return_value = True
+    mock_stat.return_value = REGULAR_FILE_STAT
     mock_access.return_value = False
     
     result = process_fit_file('noaccess.fit', 70, 30, 'male')
     assert result.success is False
     assert "Permission denied" in result.error_message
 
-@patch('os.path.exists')
-@patch('os.path.isfile')
+@patch('os.stat')
 @patch('os.access')
-@patch('src.services.fit_processor.FitFile')
-def test_process_fit_file_invalid_fit_file(mock_fitfile_cls, mock_access, mock_isfile, mock_exists):
+@patch('fitparse.FitFile')
+def test_process_fit_file_invalid_fit_file(mock_fitfile_cls, mock_access, mock_stat):
     """Test that process_fit_file returns error result for invalid FIT file."""
-    mock_exists.return_value = True
-    mock_isfile.return_value = True
+    mock_stat.return_value = REGULAR_FILE_STAT
     mock_access.return_value = True
     mock_fitfile_cls.side_effect = Exception("Invalid FIT file format")
     